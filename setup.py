@@ -28,7 +28,8 @@ setup(
     python_requires=">=3.7",
     install_requires=requirements,
     extras_require={
-        'dev': test_requirements
+        'dev': test_requirements,
+        'speedups': ['pybase64', 'simplejpeg'],
     },
     include_package_data=True,
 )
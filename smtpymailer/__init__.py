@@ -1 +1,2 @@
-from .mailer import SmtpMailer, Contact
+from .mailer import SmtpMailer, Contact, BulkSendAborted
+from .pool import SmtpConnectionPool
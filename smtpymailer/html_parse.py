@@ -1,21 +1,66 @@
-import base64
 import datetime
 import hashlib
 import os
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from email.mime.image import MIMEImage
 from email.mime.multipart import MIMEMultipart
 from io import BytesIO
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Tuple, Iterable, TYPE_CHECKING
 from urllib.parse import urlparse
-import requests
-from bs4 import BeautifulSoup
-from bs4.element import Tag
-from jinja2 import Environment, FileSystemLoader, select_autoescape
-import html2text
-from PIL import Image
 
-from smtpymailer.utils import is_get_local_file, is_resolvable, guess_type_by_extension
+from smtpymailer.utils import (
+    is_get_local_file,
+    is_resolvable,
+    guess_type_by_extension,
+    ensure_list,
+    b64encode_to_str,
+    encode_base64,
+)
+
+if TYPE_CHECKING:
+    from bs4.element import Tag
+    from jinja2 import Environment, FileSystemBytecodeCache
+    from PIL import Image
+
+# C based parser used for the BeautifulSoup trees that get modified
+_PARSER = "lxml"
+
+_IMG_LOAD_MAX_WORKERS = 16
+# (connect, read) timeouts in seconds
+_IMG_REQUEST_TIMEOUT = (3, 10)
+_IMG_REQUEST_RETRIES = 2
+_IMG_REQUEST_USER_AGENT = "smtpymailer"
+_IMG_READ_CHUNK_SIZE = 64 * 1024
+# remote images larger than this are not downloaded, the src is left as is
+_MAX_REMOTE_IMG_BYTES = 10 * 1024 * 1024
+_CID_DIGEST_SIZE = 8
+_JPEG_QUALITY = 85
+
+# valid values of the data-convert and data-format img attributes, see `change_image_type`
+_VALID_CONVERT_TYPES = frozenset(("png", "jpg", "gif", "jpeg"))
+_VALID_PIXEL_FORMATS = frozenset(("rgb", "rgba"))
+
+_IMG_TAG_RE = re.compile(r"<img\b", re.IGNORECASE)
+
+# matches either a markdown header symbol, or a run of blank lines (which may contain header symbols), so the
+# plain-text clean-up is a single pass
+_PLAIN_TEXT_CLEANUP_RE = re.compile(r"(#+ )|(\n(?:\s|#+ )*\n)")
+
+# remote images are downloaded through a shared session, so connections to the same host are kept alive and reused.
+# requests, Pillow, html2text and bs4 are imported where they're used, so importing smtpymailer doesn't pay for them up
+# front
+_session = None
+_session_lock = threading.Lock()
+
+# remote images are cached by URL, bounded by the total size of the cached image data
+_REMOTE_IMG_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_remote_img_cache = OrderedDict()
+_remote_img_cache_bytes = 0
+_remote_img_cache_lock = threading.Lock()
 
 
 def check_data_in_html_el(html_content: str):
@@ -36,17 +81,37 @@ def check_data_in_html_el(html_content: str):
         >>> check_data_in_html_el(html_content)
         {'base64': 1, 'cid': 1, 'data-smtpymailer': 0}
     """
-    soup = BeautifulSoup(html_content, "html.parser")
-
-    data_found = {"base64": 0, "cid": 0, "data-smtpymailer": 0}
-
-    for img in soup.find_all("img"):
-        src = img.get("src", "")
-        data_found["base64"] += 1 if ";base64," in src else 0
-        data_found["cid"] += 1 if "cid:smtpymailer-image" in src else 0
-        data_found["data-smtpymailer"] += 1 if "data-smtpymailer" in img.attrs else 0
-
-    return data_found
+    # the counts are kept in locals while scanning
+    base64_count = cid_count = data_smtpymailer_count = 0
+
+    # without any img tags there is nothing to count, so skip parsing entirely
+    if not _IMG_TAG_RE.search(html_content):
+        return {
+            "base64": base64_count,
+            "cid": cid_count,
+            "data-smtpymailer": data_smtpymailer_count,
+        }
+
+    from selectolax.lexbor import LexborHTMLParser
+
+    # read-only scan, so selectolax's lexbor parser is used rather than building a BeautifulSoup tree
+    tree = LexborHTMLParser(html_content)
+
+    # read the attributes dict once per img, rather than going through the node for each check
+    for img in tree.css("img"):
+        attrs = img.attributes
+        # valueless attributes are None in selectolax
+        src = attrs.get("src") or ""
+        # bools add as 0/1, so there is no branch per check
+        base64_count += ";base64," in src
+        cid_count += "cid:smtpymailer-image" in src
+        data_smtpymailer_count += "data-smtpymailer" in attrs
+
+    return {
+        "base64": base64_count,
+        "cid": cid_count,
+        "data-smtpymailer": data_smtpymailer_count,
+    }
 
 
 def change_image_type(element: "Tag", mime_type: str, img_data: bytes):
@@ -81,14 +146,14 @@ def change_image_type(element: "Tag", mime_type: str, img_data: bytes):
 
     if "data-convert" in element.attrs:
         convert_to_type = element.get("data-convert").lower()
-        if convert_to_type not in ["png", "jpg", "gif", "jpeg"]:
+        if convert_to_type not in _VALID_CONVERT_TYPES:
             raise ValueError(
                 f"Invalid value for data-convert attribute: {convert_to_type}"
             )
         pixel_format = "RGB"
         if "data-format" in element.attrs:
             pixel_format = element.get("data-format").lower()
-            if pixel_format not in ["rgb", "rgba"]:
+            if pixel_format not in _VALID_PIXEL_FORMATS:
                 raise ValueError(
                     f"Invalid value for data-format attribute: {pixel_format}"
                 )
@@ -97,21 +162,241 @@ def change_image_type(element: "Tag", mime_type: str, img_data: bytes):
         file_format = file_format.replace("jpeg", "jpg").lower()
 
         if convert_to_type != file_format:
+            from PIL import Image
+
             img = Image.open(BytesIO(img_data))
-            with BytesIO() as img_io:
-                img.convert(pixel_format.upper()).save(img_io, convert_to_type.upper())
-                img_data = img_io.getvalue()  # Update img_data with JPEG data
-                mime_type = f'image/{convert_to_type.lower().replace("jpg", "jpeg")}'  # Update content_type to JPEG
+            # only convert the pixel format if needed, convert() always copies the full pixel buffer
+            target_mode = pixel_format.upper()
+            if img.mode != target_mode:
+                img = img.convert(target_mode)
+            save_format = convert_to_type.upper().replace("JPG", "JPEG")
+            converted_data = (
+                encode_jpeg(img) if save_format == "JPEG" and img.mode == "RGB" else None
+            )
+            if converted_data is None:
+                save_options = (
+                    {"optimize": True, "quality": _JPEG_QUALITY}
+                    if save_format == "JPEG"
+                    else {}
+                )
+                with BytesIO() as img_io:
+                    img.save(img_io, save_format, **save_options)
+                    converted_data = img_io.getvalue()
+            img_data = converted_data  # Update img_data with the converted data
+            mime_type = f'image/{convert_to_type.lower().replace("jpg", "jpeg")}'  # Update content_type to match
 
     return img_data, mime_type
 
 
+@lru_cache(maxsize=1)
+def _get_simplejpeg():
+    """Imports simplejpeg and numpy if both are installed, returns None otherwise."""
+    try:
+        import numpy
+        import simplejpeg
+    except ImportError:
+        return None
+    return simplejpeg, numpy
+
+
+def encode_jpeg(img: "Image.Image") -> Optional[bytes]:
+    """
+    Encodes an RGB image as JPEG with simplejpeg (libjpeg-turbo), which is considerably faster than Pillow's encoder.
+
+    Args:
+        img (Image.Image): The RGB Pillow image to encode.
+
+    Returns:
+        Optional[bytes]: The JPEG data, or None if simplejpeg isn't installed and Pillow should be used instead.
+
+    """
+    modules = _get_simplejpeg()
+    if modules is None:
+        return None
+    simplejpeg, numpy = modules
+    return simplejpeg.encode_jpeg(
+        numpy.asarray(img), quality=_JPEG_QUALITY, colorspace="RGB"
+    )
+
+
+def get_session() -> "requests.Session":
+    """
+    Returns the shared session used to download remote images, creating it on first use.
+
+    Returns:
+        requests.Session: The shared session.
+
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                session = requests.Session()
+                session.headers["User-Agent"] = _IMG_REQUEST_USER_AGENT
+                # transient connection errors and server errors are retried with a short backoff
+                retries = Retry(
+                    total=_IMG_REQUEST_RETRIES,
+                    backoff_factor=0.2,
+                    status_forcelist=(500, 502, 503, 504),
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=16, pool_maxsize=32, max_retries=retries
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def clear_remote_img_cache():
+    """
+    Clears the cache of downloaded remote images.
+    """
+    global _remote_img_cache_bytes
+    with _remote_img_cache_lock:
+        _remote_img_cache.clear()
+        _remote_img_cache_bytes = 0
+
+
+def read_and_hash_img(
+    chunks: Iterable[bytes], max_bytes: Optional[int] = None
+) -> Tuple[bytes, str]:
+    """
+    Reads image data from an iterable of chunks, hashing each chunk as it is read so the data is only walked once.
+
+    Args:
+        chunks (Iterable[bytes]): The chunks of image data.
+        max_bytes (Optional[int]): The maximum size of the image data, reading stops as soon as it is exceeded.
+            Defaults to no limit.
+
+    Returns:
+        tuple: The image data and the hex digest used to build its CID.
+
+    Raises:
+        ValueError: If the image data is larger than `max_bytes`.
+
+    """
+    buffer = BytesIO()
+    hasher = hashlib.blake2b(digest_size=_CID_DIGEST_SIZE)
+    for chunk in chunks:
+        if max_bytes is not None and buffer.tell() + len(chunk) > max_bytes:
+            raise ValueError(f"Image is larger than {max_bytes} bytes")
+        buffer.write(chunk)
+        hasher.update(chunk)
+    return buffer.getvalue(), hasher.hexdigest()
+
+
+def fetch_remote_img(
+    src: str, max_image_bytes: int = _MAX_REMOTE_IMG_BYTES
+) -> Tuple[bytes, str]:
+    """
+    Downloads a remote image. Downloads are cached by URL (least recently used are evicted once the cache holds more
+    than 64MB), so images shared between emails, i.e. a logo, are only downloaded once.
+
+    Args:
+        src (str): The URL of the image.
+        max_image_bytes (int): The maximum size of the image, the download is abandoned once it is exceeded.
+            Defaults to 10MB.
+
+    Returns:
+        tuple: The image data and its hex digest, see `read_and_hash_img`.
+
+    Raises:
+        requests.RequestException: If the request fails, failures are not cached.
+        ValueError: If the image is larger than `max_image_bytes`.
+
+    """
+    global _remote_img_cache_bytes
+    with _remote_img_cache_lock:
+        if src in _remote_img_cache:
+            _remote_img_cache.move_to_end(src)
+            return _remote_img_cache[src]
+
+    response = get_session().get(src, stream=True, timeout=_IMG_REQUEST_TIMEOUT)
+    try:
+        response.raise_for_status()
+        loaded = read_and_hash_img(
+            response.iter_content(chunk_size=_IMG_READ_CHUNK_SIZE), max_image_bytes
+        )
+    finally:
+        response.close()
+
+    with _remote_img_cache_lock:
+        size = len(loaded[0])
+        if src not in _remote_img_cache and size <= _REMOTE_IMG_CACHE_MAX_BYTES:
+            _remote_img_cache[src] = loaded
+            _remote_img_cache_bytes += size
+            while _remote_img_cache_bytes > _REMOTE_IMG_CACHE_MAX_BYTES:
+                _, (evicted, _) = _remote_img_cache.popitem(last=False)
+                _remote_img_cache_bytes -= len(evicted)
+
+    return loaded
+
+
+def load_img_data(
+    src: str, max_image_bytes: int = _MAX_REMOTE_IMG_BYTES
+) -> Optional[Tuple[bytes, str]]:
+    """
+    Loads the image data for an img src, either from the local filesystem or by downloading it.
+
+    Args:
+        src (str): The src of the img element, a local file path or a URL.
+        max_image_bytes (int): The maximum size of a remote image. Defaults to 10MB.
+
+    Returns:
+        Optional[tuple]: The image data and its hex digest (see `read_and_hash_img`), or None if the src is neither a
+            local file nor a resolvable URL, the request fails or the remote image is too large.
+
+    """
+    is_local_file, path = is_get_local_file(src)
+    if is_local_file:
+        with open(path, "rb") as f:
+            return read_and_hash_img(iter(partial(f.read, _IMG_READ_CHUNK_SIZE), b""))
+
+    if is_resolvable(src):
+        from requests import RequestException
+
+        try:
+            return fetch_remote_img(src, max_image_bytes)
+        except (RequestException, ValueError):
+            return None
+
+    return None
+
+
+def _guess_img_content_type(src: str, img_data: bytes) -> str:
+    """
+    Works out an image's MIME type, from the extension of its src's path first, ignoring any query string, then from
+    the image data itself. Falls back to image/png if neither identifies it.
+    """
+    content_type = guess_type_by_extension(urlparse(src).path)
+    if content_type and content_type.startswith("image/"):
+        return content_type
+
+    from PIL import Image
+
+    try:
+        with Image.open(BytesIO(img_data)) as image:
+            content_type = Image.MIME.get(image.format)
+    except OSError:
+        content_type = None
+    return content_type or "image/png"
+
+
 def process_img_element(
-        img: Tag,
+        img: "Tag",
         idx: int,
         convert_to_base64: bool = False,
         email_message: MIMEMultipart = None,
-):
+        img_data: Optional[bytes] = None,
+        img_digest: Optional[str] = None,
+        cids: Optional[dict] = None,
+) -> bool:
     """
     Process and manipulate HTML img elements, converting the image to either CID attachments or base64 encoded.
     If the request fails the element is ignored and left with the original src.
@@ -126,6 +411,14 @@ def process_img_element(
         convert_to_base64 (bool): Boolean indicating whether to convert the image to base64. Defaults to False.
         email_message (MIMEMultipart): An instance of the EmailMessage class. If provided, the image will be attached
             to the email message as an inline image.
+        img_data (Optional[bytes]): The already loaded image data, if not provided it is loaded from the src.
+        img_digest (Optional[str]): The hex digest of `img_data` if already known, used to build the CID.
+        cids (Optional[dict]): A mapping of image digests to the CIDs already attached to `email_message`. Images
+            that are already attached reuse that CID rather than being attached again, the mapping is updated with
+            new attachments.
+
+    Returns:
+        bool: True if the element's src was altered, False if it was left as is.
 
     Notes:
         all below are valid examples:
@@ -135,50 +428,55 @@ def process_img_element(
             > <img src="/home/user/img.jpg" data-convert='png'/>
 
     """
-    img_data = None
-
     src = img.get("src", "")
-    content_type = guess_type_by_extension(src)
-
-    is_local_file, path = is_get_local_file(src)
-    if is_local_file:
-        with open(path, "rb") as f:
-            img_data = f.read()
 
-    elif is_resolvable(src):
-        try:
-            response = requests.get(src, stream=True)
-            response.raise_for_status()
-            img_data = response.content
-        except requests.RequestException:
-            # if the request fails, ignore the element and leave the original src
-            return
+    if img_data is None:
+        img_data, img_digest = load_img_data(src) or (None, None)
 
+    # if the image can't be loaded, ignore the element and leave the original src
     if img_data:
-
-        img_data, content_type = change_image_type(img, content_type, img_data)
+        content_type = _guess_img_content_type(src, img_data)
+        converted_data, content_type = change_image_type(img, content_type, img_data)
+        if converted_data is not img_data:
+            img_data, img_digest = converted_data, None
 
         if convert_to_base64:
-            parsed_url = urlparse(src)
-            img_ext = os.path.splitext(parsed_url.path)[1].lstrip(".")
-            base64_data = base64.b64encode(img_data).decode("utf-8")
-            img["src"] = f"data:image/{img_ext};base64,{base64_data}"
+            # the content type is already known, so there's no need to parse the extension out of the src again
+            base64_data = b64encode_to_str(img_data)
+            img["src"] = f"data:{content_type};base64,{base64_data}"
             img["data-smtpymailer"] = ""
+            return True
 
         elif email_message is not None:
-            hash_object = hashlib.md5(img_data)
-            cid = hash_object.hexdigest() + f"{idx}"
-            maintype, subtype = content_type.split("/")
+            # the hash only needs to make the CID unique, so use the faster blake2b over md5
+            if img_digest is None:
+                img_digest = hashlib.blake2b(
+                    img_data, digest_size=_CID_DIGEST_SIZE
+                ).hexdigest()
+
+            # the same image used several times in an email is only attached once
+            cid = cids.get(img_digest) if cids is not None else None
+            if cid is None:
+                cid = img_digest + f"{idx}"
+                maintype, subtype = content_type.split("/")
+
+                # Create an instance of MIMEImage
+                mime_image = MIMEImage(
+                    img_data, _subtype=subtype, _encoder=encode_base64
+                )
+                mime_image.add_header("Content-ID", f"<{cid}>")
+                mime_image.add_header("Content-Disposition", "inline")
 
-            # Create an instance of MIMEImage
-            mime_image = MIMEImage(img_data, _subtype=subtype)
-            mime_image.add_header("Content-ID", f"<{cid}>")
-            mime_image.add_header("Content-Disposition", "inline")
+                # Attach it to the email message
+                email_message.attach(mime_image)
+                if cids is not None:
+                    cids[img_digest] = cid
 
-            # Attach it to the email message
-            email_message.attach(mime_image)
             img["src"] = f"cid:{cid}"
             img["data-smtpymailer"] = ""
+            return True
+
+    return False
 
 
 def convert_img_elements(html_content: str, email: MIMEMultipart) -> str:
@@ -190,22 +488,73 @@ def convert_img_elements(html_content: str, email: MIMEMultipart) -> str:
         email (MIMEMultipart): An instance of the EmailMessage class.
 
     Returns:
-        str: The modified HTML content with img elements converted to base64.
+        str: The modified HTML content with img elements converted to base64, or the original HTML content if no
+            img element was altered.
 
     """
-    soup = BeautifulSoup(html_content, "html.parser")
-    for idx, img in enumerate(soup.find_all("img")):
+    # only img elements with a data-base or data-cid attribute are altered, without either there's nothing to parse for.
+    # attribute names are case-insensitive, so check the lowered content
+    lowered = html_content.lower()
+    if "data-base" not in lowered and "data-cid" not in lowered:
+        return html_content
+
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, _PARSER)
+    img_elements = [
+        (idx, img)
+        for idx, img in enumerate(soup.find_all("img"))
+        if "data-base" in img.attrs or "data-cid" in img.attrs
+    ]
+
+    # load each distinct src once, up front and concurrently, the elements are then altered in order so CIDs stay
+    # deterministic
+    srcs = list(dict.fromkeys(img.get("src", "") for _, img in img_elements))
+    if len(srcs) > 1:
+        with ThreadPoolExecutor(
+            max_workers=min(len(srcs), _IMG_LOAD_MAX_WORKERS)
+        ) as executor:
+            img_datas = dict(zip(srcs, executor.map(load_img_data, srcs)))
+    else:
+        # nothing to overlap, so don't start a pool for a single image
+        img_datas = {src: load_img_data(src) for src in srcs}
+
+    modified = False
+    cids = {}
+    for idx, img in img_elements:
+        loaded = img_datas[img.get("src", "")]
+        if not loaded:
+            continue
+        img_data, img_digest = loaded
         if "data-base" in img.attrs:
-            process_img_element(img, idx, convert_to_base64=True)
-        elif "data-cid" in img.attrs:
-            process_img_element(img, idx, email_message=email)
-    return str(soup)
+            modified |= process_img_element(
+                img, idx, convert_to_base64=True, img_data=img_data
+            )
+        else:
+            modified |= process_img_element(
+                img,
+                idx,
+                email_message=email,
+                img_data=img_data,
+                img_digest=img_digest,
+                cids=cids,
+            )
+
+    # only re-serialize the soup if an element was altered
+    return str(soup) if modified else html_content
+
 
+def _clean_plain_text_match(match: "re.Match") -> str:
+    """Replacement for `_PLAIN_TEXT_CLEANUP_RE`, header symbols are removed and blank lines collapsed."""
+    return "" if match.group(1) else "\n\n"
 
+
+@lru_cache(maxsize=32)
 def convert_html_to_plain_text(html_text: str) -> str:
     """
     Converts HTML text to plain text, ignoring images, links, and markdown-style headers,
-    and removing excess whitespace.
+    and removing excess whitespace. Results are cached, so the same HTML sent to many recipients is only converted
+    once.
 
     Args:
       html_text (str): HTML text
@@ -214,7 +563,13 @@ def convert_html_to_plain_text(html_text: str) -> str:
         str: plain text version of the email
     """
 
-    # Create a html2text object
+    # without tags or entities there is nothing to convert, so skip the html2text parse
+    if not html_text or ("<" not in html_text and "&" not in html_text):
+        return html_text.strip()
+
+    import html2text
+
+    # Create a html2text object, instances aren't reused as parser state carries over between `handle` calls
     h = html2text.HTML2Text()
 
     # Configure html2text
@@ -227,28 +582,67 @@ def convert_html_to_plain_text(html_text: str) -> str:
     # Convert HTML to plain text
     plain_text = h.handle(html_text)
 
-    # Remove markdown header symbols
-    plain_text = re.sub(r"#+ ", "", plain_text)
-
-    # Remove extra whitespace/newlines after paragraph breaks
-    plain_text = re.sub(r"\n\s*\n", "\n\n", plain_text)
+    # Remove markdown header symbols and extra whitespace/newlines after paragraph breaks
+    plain_text = _PLAIN_TEXT_CLEANUP_RE.sub(_clean_plain_text_match, plain_text)
 
     return plain_text.strip()
 
 
-def create_jinja_environment(template_paths: List[str]) -> Environment:
+def create_jinja_environment(template_paths: Union[str, List[str]]) -> "Environment":
     """
-    Creates a Jinja2 environment.
+    Creates a Jinja2 environment. Environments are cached per set of template paths, so the templates Jinja has
+    already compiled are reused by later renders instead of being recompiled every send. Compiled templates are
+    kept for the life of the process and are not checked for changes on disk.
 
     Args:
-        template_paths (List[str]): List of paths where the templates can be found.
+        template_paths (Union[str, List[str]]): A path or list of paths where the templates can be found.
 
     Returns:
         Environment: The Jinja2 Environment object.
     """
+    return _get_jinja_environment(tuple(ensure_list(template_paths)))
+
+
+@lru_cache(maxsize=1)
+def _get_bytecode_cache() -> Optional["FileSystemBytecodeCache"]:
+    """
+    Gets the on-disk cache of compiled template bytecode, shared between processes so each new worker doesn't have
+    to recompile every template. The directory is taken from the `SMTPYMAILER_BYTECODE_DIR` environment variable,
+    otherwise Jinja's private per-user temp directory is used.
+
+    Returns:
+        Optional[FileSystemBytecodeCache]: The bytecode cache, or None if the cache directory can't be created.
+    """
+    from jinja2 import FileSystemBytecodeCache
+
+    directory = os.environ.get("SMTPYMAILER_BYTECODE_DIR")
+    try:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return FileSystemBytecodeCache(directory)
+    except (OSError, RuntimeError):
+        return None
+
+
+@lru_cache(maxsize=16)
+def _get_jinja_environment(template_paths: Tuple[str, ...]) -> "Environment":
+    """
+    Args:
+        template_paths (Tuple[str, ...]): The paths where the templates can be found.
+
+    Returns:
+        Environment: The cached Jinja2 Environment object for the paths.
+    """
+    # jinja2 is only imported once a template is rendered, as it's slow to import and not needed for html_content
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
     return Environment(
-        loader=FileSystemLoader(template_paths),
+        loader=FileSystemLoader(list(template_paths)),
         autoescape=select_autoescape(["html", "xml"]),
+        # keep every compiled template, and don't stat the template files on each render to check for changes
+        auto_reload=False,
+        cache_size=-1,
+        bytecode_cache=_get_bytecode_cache(),
     )
 
 
@@ -1,13 +1,22 @@
+import asyncio
+import functools
 import os
 import pathlib
-import smtplib
+import re
+import socket
+import ssl
+import stat
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from email.policy import compat32
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.utils import formatdate, make_msgid
+from functools import lru_cache
 from typing import Union, Optional, List
-import dns.resolver
 
-import pydig
 from dotenv import load_dotenv
 
 from smtpymailer.html_parse import (
@@ -15,6 +24,8 @@ from smtpymailer.html_parse import (
     convert_img_elements,
     make_html_content
 )
+from smtpymailer.pool import SmtpConnectionPool
+from smtpymailer.smtp import PipeliningSMTP, PipeliningSMTP_SSL
 from smtpymailer.utils import (
     is_file_with_path,
     convert_bool,
@@ -29,8 +40,58 @@ from smtpymailer.validation import (
     spf_check,
     get_address_type,
     validate_dkim_record,
+    resolve_txt_records,
+    clear_dns_cache,
 )
 
+# The default message policy with CRLF line endings, so serialized messages can be handed to `sendmail` as bytes
+# without smtplib re-encoding them and rewriting every line ending
+_SMTP_POLICY = compat32.clone(linesep="\r\n")
+
+# template paths already found by validate_send_email
+_FOUND_TEMPLATES = set()
+
+# guards the lazy creation of each mailer's connection pool
+_POOL_LOCK = threading.Lock()
+
+# (sender domain, DKIM selector, mail server) of setups that passed validation, mapped to when they passed. Mailers
+# created within _AUTH_CACHE_TTL seconds for the same setup skip the DNS checks
+_AUTH_CACHE = {}
+_AUTH_CACHE_TTL = 900
+
+# An SPF record starts with its version tag, other TXT records only mentioning spf (i.e. verification tokens) don't
+_SPF_RE = re.compile(r"v=spf1(?:\s|$)", re.IGNORECASE)
+
+# send_many stops once at least this many emails have been sent and too many of them failed, a batch failing that
+# badly usually means the server is refusing or rate limiting the sender, so carrying on only makes it worse
+_ABORT_MIN_MESSAGES = 30
+
+
+@lru_cache(maxsize=1)
+def _get_msgid_domain() -> str:
+    """
+    Gets this host's fully qualified domain name for Message-Ids. `make_msgid` looks it up on every call, which can
+    mean a reverse DNS lookup per email, so it's looked up once and cached.
+    """
+    return socket.getfqdn()
+
+
+@lru_cache(maxsize=1)
+def _load_dotenv() -> bool:
+    """
+    Loads the .env file into the environment once per process. `load_dotenv` searches up the directory tree for the
+    file and parses it on every call, and variables already in the environment aren't overridden by later calls anyway.
+    """
+    return load_dotenv()
+
+
+@lru_cache(maxsize=1)
+def _get_ssl_context() -> ssl.SSLContext:
+    """
+    Gets the SSL context for implicit TLS connections, created once as loading the system's CA certificates is slow.
+    """
+    return ssl.create_default_context()
+
 
 class Contact:
     """
@@ -55,6 +116,8 @@ class Contact:
         EmailNotValidError: If the email address is not valid.
     """
 
+    __slots__ = ("email", "name")
+
     email: str
     name: Optional[str]
 
@@ -92,19 +155,44 @@ class Contact:
         return self.email.split("@")[1]
 
 
+def _template_exists(directory: str, template: str) -> bool:
+    """
+    Checks if a template file exists in a directory. Templates found are remembered, so sending the same template
+    again doesn't stat it again, templates not found are checked every time as they may be added later.
+
+    Args:
+        directory (str): The template directory, or "" for a template path.
+        template (str): The template file name or path.
+
+    Returns:
+        bool: True if the template file exists.
+
+    """
+    path = os.path.join(directory, template)
+    if path in _FOUND_TEMPLATES:
+        return True
+    if is_file_with_path(path):
+        _FOUND_TEMPLATES.add(path)
+        return True
+    return False
+
+
 def validate_send_email(
     html_content,
     template,
     template_directory,
     subject,
     recipients,
+    attachments=None,
 ):
     """
-    Validates the parameters for the `send_email` function. it performs the following validations:
+    Validates the parameters for the `send_email` function, before any rendering or file reading is done. It performs
+    the following validations:
         * If neither `html_content` nor `template` is provided.
-        * If `template` is a file name but `template_directory` is not provided.
         * If `subject` is empty.
         * If `recipients` is not provided.
+        * If `template` is a file name but `template_directory` is not provided.
+        * If any of the `attachments` don't exist.
 
     Args:
         html_content (Optional(str)): The HTML content of the email.
@@ -116,33 +204,21 @@ def validate_send_email(
         subject (str): The subject of the email.
         recipients (str or list): The recipient(s) of the email. This can be a single email address as a string,
             or a list of email addresses.
+        attachments (Optional(Union[list,str])): The attachment file path(s).
 
     Raises:
         ValueError: If neither `html_content` nor `template` is provided.
-        FileNotFoundError: If `template` is a file name but `template_directory` is not provided.
         ValueError: If `subject` is empty.
         ValueError: If `recipients` is not provided.
+        FileNotFoundError: If `template` is a file name but `template_directory` is not provided.
+        FileNotFoundError: If any attachment files don't exist, listing all of them.
 
     """
-    if not html_content or not template:
-        if template:
-            if not is_file_with_path(template) and not template_directory:
-                raise FileNotFoundError(
-                    "Template file not found. Please provide either a full path to the template or a template file and template directory"
-                )
-            elif not is_file_with_path(template) and not any(
-                [
-                    is_file_with_path(os.path.join(x, template))
-                    for x in ensure_list(template_directory)
-                ]
-            ):
-                raise FileNotFoundError(
-                    "Template file not found. Please provide either a full path to the template or a template file and template directory"
-                )
-        if not html_content and not template:
-            raise ValueError(
-                "Please provide either 'html_content' or a jinja template to render"
-            )
+    # the cheap checks first, so doomed calls fail before touching the file system
+    if not html_content and not template:
+        raise ValueError(
+            "Please provide either 'html_content' or a jinja template to render"
+        )
 
     if not subject:
         raise ValueError("Subject cannot be empty. Please provide a subject")
@@ -152,6 +228,40 @@ def validate_send_email(
             "Recipients not provided. Please provide a single recipient's email or a list of email addresses"
         )
 
+    # html_content is used over the template when both are given
+    if template and not html_content and not _template_exists("", template):
+        if not any(
+            _template_exists(x, template) for x in ensure_list(template_directory)
+        ):
+            raise FileNotFoundError(
+                "Template file not found. Please provide either a full path to the template or a template file and template directory"
+            )
+
+    # every missing attachment is reported together, rather than one per failed send
+    missing_attachments = [
+        attachment_file_path
+        for attachment_file_path in ensure_list(attachments)
+        if not is_file_with_path(os.path.expanduser(attachment_file_path))
+    ]
+    if missing_attachments:
+        raise FileNotFoundError(
+            f"Invalid or non existent attachment file path(s): {', '.join(map(str, missing_attachments))}"
+        )
+
+
+class BulkSendAborted(Exception):
+    """
+    Raised by `SmtpMailer.send_many` when so many emails fail that the rest of the batch isn't sent.
+
+    Attributes:
+        results (list): The result for each message, as returned by `send_many`. True if the email was sent, the
+            exception raised while building or sending it, or None if it wasn't tried.
+    """
+
+    def __init__(self, message: str, results: list):
+        super().__init__(message)
+        self.results = results
+
 
 class SmtpMailer:
     """
@@ -164,13 +274,38 @@ class SmtpMailer:
     mail_server: str
     mail_port: int
     mail_use_tls: bool
+    mail_use_ssl: bool = False
     mail_username: str
     mail_password: str
     mail_dkim_selector: str = "mail"
+    mail_skip_dns_validation: bool = False
     message: MIMEMultipart
     message_alt: MIMEMultipart
-
-    def __init__(self, sender_email: str, sender_name: Optional[str], **kwargs):
+    max_connections: int = 4
+    max_messages_per_connection: int = 100
+    validate_recipients: bool = True
+    _pool: Optional[SmtpConnectionPool] = None
+    _executor: Optional[ThreadPoolExecutor] = None
+    _pool_finalizer: Optional[weakref.finalize] = None
+    _executor_finalizer: Optional[weakref.finalize] = None
+    _build_lock: threading.Lock
+    _dns_validated: Optional[threading.Event] = None
+    _dns_error: Optional[Exception] = None
+    _valid_reply_tos: Optional[set] = None
+
+    def __init__(
+        self,
+        sender_email: str,
+        sender_name: Optional[str],
+        max_connections: int = 4,
+        max_messages_per_connection: int = 100,
+        revalidate_dns: bool = False,
+        validate_dns: Optional[str] = None,
+        validate_recipients: bool = True,
+        validate_email: bool = True,
+        verify_credentials: bool = True,
+        **kwargs,
+    ):
         """
         Send emails from alternative domains names to the mail server. DNS records must be correctly assigned to the
         sending domain.
@@ -196,6 +331,8 @@ class SmtpMailer:
 
             **MAIL_USE_TLS**: Boolean to enable/disable Transport Layer Security.
 
+            **MAIL_USE_SSL**: Optional. Boolean to connect with implicit TLS (SMTP_SSL), on by default for port 465.
+
             **MAIL_USERNAME**: The username for the email server.
 
             **MAIL_PASSWORD**: The password for the email server.
@@ -203,18 +340,134 @@ class SmtpMailer:
             **MAIL_DKIM_SELECTOR**: The DKIM selector to use for email signing, created by the mail server and applied
             to the sending domain's DNS records.
 
+            **MAIL_SKIP_DNS_VALIDATION**: Optional. Boolean to not check the sender domain's DNS records, when
+            `validate_dns` isn't passed.
+
 
         Args:
             sender_email (str): Email address to send from
             sender_name (str): Name to use in email from field
+            max_connections (int): The maximum number of open connections to the mail server, used to send
+                concurrently. Defaults to 4.
+            max_messages_per_connection (int): The number of emails sent over a connection before it's closed and
+                replaced, servers often limit the emails per session. Defaults to 100.
+            revalidate_dns (bool): Check the sender domain's DNS records even if the same setup passed in the last 15
+                minutes. Defaults to False.
+            validate_dns (str): When to check the sender domain's DNS records. "sync" checks them before returning,
+                "async" checks them in the background so the mailer is returned straight away (sends wait for the
+                check and raise if it failed), and "skip" doesn't check them. Defaults to "skip" if the
+                MAIL_SKIP_DNS_VALIDATION config value is set, otherwise "sync".
+            validate_recipients (bool): Fully validate every recipient address on each send. Set to False for lists
+                that are already clean, only the basic local@domain.tld format is then checked. Defaults to True.
+            validate_email (bool): Validate the sender email address. Defaults to True.
+            verify_credentials (bool): Connect and log in to the mail server when the mailer is created, to check the
+                server details. The connection is kept open and used by the first send, or quit when the mailer is
+                closed or garbage collected. Set to False to skip the check when the details are known to be good, the
+                first send then connects. Defaults to True.
 
         """
 
-        self.sender = Contact(sender_email, sender_name)
-        self._setup_email_server_auth(**kwargs)
-        self._validate_auth_setup()
+        if max_connections < 1:
+            raise ValueError("max_connections must be at least 1")
+        if validate_dns not in (None, "sync", "async", "skip"):
+            raise ValueError("validate_dns must be one of 'sync', 'async' or 'skip'")
+
+        self.max_connections = max_connections
+        self.max_messages_per_connection = max_messages_per_connection
+        self.validate_recipients = validate_recipients
+        self._build_lock = threading.Lock()
+        self.sender = Contact(sender_email, sender_name, validate_email)
+        self._setup_email_server_auth(verify_credentials, **kwargs)
+
+        if validate_dns is None:
+            validate_dns = "skip" if self.mail_skip_dns_validation else "sync"
+        if validate_dns == "sync":
+            self._validate_auth_setup(revalidate_dns=revalidate_dns)
+        elif validate_dns == "async":
+            self._dns_validated = threading.Event()
+            threading.Thread(
+                target=self._validate_auth_setup_in_background,
+                args=(revalidate_dns,),
+                daemon=True,
+            ).start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Closes the mailer's open connections to the mail server. The mailer can still be used afterwards, a new
+        connection is opened by the next send. Connections are also closed when the mailer is garbage collected, but
+        closing it (or using it as a context manager) quits them as soon as you're done.
+        """
+        with _POOL_LOCK:
+            finalizers = (self._executor_finalizer, self._pool_finalizer)
+            self._pool = self._executor = None
+            self._pool_finalizer = self._executor_finalizer = None
+        # each finalizer runs at most once, calling it now also stops it running when the mailer is collected
+        for finalizer in finalizers:
+            if finalizer is not None:
+                finalizer()
+
+    @staticmethod
+    def clear_dns_cache():
+        """
+        Forgets every sender domain setup that passed validation, and every cached DNS lookup, so the next mailer
+        created checks the DNS records again, i.e. after fixing a domain's records.
+        """
+        _AUTH_CACHE.clear()
+        clear_dns_cache()
+
+    def _get_pool(self) -> SmtpConnectionPool:
+        """
+        Gets the mailer's pool of server connections, creating it on first use. Connections are kept open between
+        `send_email` calls rather than connecting and authenticating for every email, and are checked with a NOOP
+        before reuse if they've been idle.
+
+        Returns:
+            SmtpConnectionPool: The connection pool.
 
-    def _validate_auth_setup(self):
+        """
+        with _POOL_LOCK:
+            if self._pool is None:
+                # the pool only holds a weak reference back to the mailer, so a mailer that's no longer used is
+                # collected straight away and its finalizer quits the connections
+                mailer = weakref.ref(self)
+                self._pool = SmtpConnectionPool(
+                    lambda: mailer()._connect_to_server(),
+                    size=self.max_connections,
+                    max_messages_per_connection=self.max_messages_per_connection,
+                )
+                self._pool_finalizer = weakref.finalize(self, self._pool.close_all)
+            return self._pool
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Gets the mailer's worker threads for `send_email_async`, creating them on first use. There's one per pooled
+        connection, so no more emails are in flight than can be sent at once.
+
+        Returns:
+            ThreadPoolExecutor: The executor.
+
+        """
+        with _POOL_LOCK:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_connections)
+                self._executor_finalizer = weakref.finalize(
+                    self, self._executor.shutdown, wait=False
+                )
+            return self._executor
+
+    def _validate_auth_setup(self, revalidate_dns: bool = False):
         """
         Validates the setup of the email server. Checks for the following:
             - sender - validated email
@@ -222,6 +475,12 @@ class SmtpMailer:
             - DKIM record for your mail server
             - DMARC record for your mail server
 
+        A setup that passed is remembered for 15 minutes, so mailers created again for the same sender domain, DKIM
+        selector and mail server skip the DNS lookups.
+
+        Args:
+            revalidate_dns (bool): Check the DNS records even if the setup passed recently. Defaults to False.
+
         Returns:
             bool
 
@@ -229,47 +488,79 @@ class SmtpMailer:
             Exception: if the setup is not valid
 
         """
-        resolver = pydig.Resolver(
-            nameservers=["1.1.1.1", "1.0.0.1", "8.8.8.8", "8.8.4.4"]
-        )
         sender_domain = self.sender.get_domain()
 
+        cache_key = (sender_domain, self.mail_dkim_selector, self.mail_server)
+        validated_at = _AUTH_CACHE.get(cache_key)
+        if (
+            not revalidate_dns
+            and validated_at is not None
+            and time.monotonic() - validated_at < _AUTH_CACHE_TTL
+        ):
+            return
+
         dmarc_records, spf_records, dkim_records = self._query_dns_records(
             sender_domain
         )
 
         self._validate_records(sender_domain, dmarc_records, spf_records, dkim_records)
 
+        _AUTH_CACHE[cache_key] = time.monotonic()
+
+    def _validate_auth_setup_in_background(self, revalidate_dns: bool):
+        """
+        Runs `_validate_auth_setup` for the "async" `validate_dns` mode, keeping any error to raise on the next send.
+        """
+        try:
+            self._validate_auth_setup(revalidate_dns=revalidate_dns)
+        except Exception as e:
+            self._dns_error = e
+        finally:
+            self._dns_validated.set()
+
+    def _wait_for_auth_validation(self):
+        """
+        Waits for a background DNS validation to finish, if one was started.
+
+        Raises:
+            Exception: If the background validation failed.
+
+        """
+        if self._dns_validated is not None:
+            self._dns_validated.wait()
+            if self._dns_error is not None:
+                raise self._dns_error.with_traceback(None)
+
     def _query_dns_records(self, sender_domain):
         """
+        Queries the sender domain's DNS records, the three lookups run concurrently and go through the in-memory TXT
+        record cache, so validating the same domain again doesn't go back out to the network until the records' TTL
+        expires.
+
         Args:
             sender_domain: The domain name of the sender for which DNS records need to be queried.
 
         Returns:
             A tuple of three lists representing the DNS records:
             - dmarc_records: A list of TXT records associated with the "_dmarc" subdomain of the sender domain.
-            - spf_records: A list of TXT records that contain "spf" keyword and are associated with the sender domain.
+            - spf_records: A list of the SPF records (TXT records starting "v=spf1") of the sender domain.
             - dkim_records: A list containing a single string, which is the concatenated DKIM record.
         """
 
-        dmarc_records = []
-        spf_records = []
-        dkim_record = ""
-
-        dmarc_answers = dns.resolver.resolve(f"_dmarc.{sender_domain}", "TXT")
-        for rdata in dmarc_answers:
-            dmarc_records.append(rdata.strings[0].decode())
-
-        spf_answers = dns.resolver.resolve(sender_domain, "TXT")
-        for rdata in spf_answers:
-            if any("spf" in txt.decode() for txt in rdata.strings):
-                spf_records.append(rdata.strings[0].decode())
+        names = (
+            f"_dmarc.{sender_domain}",
+            sender_domain,
+            f"{self.mail_dkim_selector}._domainkey.{sender_domain}",
+        )
+        with ThreadPoolExecutor(max_workers=len(names)) as executor:
+            dmarc_answers, txt_answers, dkim_records = executor.map(
+                resolve_txt_records, names
+            )
 
-        dkim_answers = dns.resolver.resolve(f"{self.mail_dkim_selector}._domainkey.{sender_domain}", "TXT")
-        for rdata in dkim_answers:
-            dkim_record = ''.join(txt.decode() for txt in rdata.strings)
+        dmarc_records = list(dmarc_answers)
+        spf_records = list(filter(_SPF_RE.match, txt_answers))
 
-        return dmarc_records, spf_records, [dkim_record] if dkim_record else []
+        return dmarc_records, spf_records, [dkim_records[-1]] if dkim_records else []
 
     def _validate_records(
         self,
@@ -300,8 +591,9 @@ class SmtpMailer:
             raise Exception(f"No valid DMARC record found for {sender_domain}")
 
         valid_spf = False
+        mail_server_address = get_address_type(self.mail_server)
         for record in spf_records:
-            if spf_check(record, **get_address_type(self.mail_server)):
+            if spf_check(record, **mail_server_address):
                 valid_spf = True
                 break
         if not valid_spf:
@@ -315,9 +607,11 @@ class SmtpMailer:
         if not valid_dkim:
             raise Exception(f"No valid DKIM record found for {sender_domain}")
 
-    def _setup_email_server_auth(self, **kwargs):
+    def _setup_email_server_auth(self, verify_credentials: bool = True, **kwargs):
         """
         Args:
+            verify_credentials (bool): Connect and log in to the mail server to check the details. The connection is
+                kept open in the mailer's pool and used by the first send. Defaults to True.
             **kwargs: Additional keyword arguments that can be passed to the method.
 
         Raises:
@@ -325,13 +619,17 @@ class SmtpMailer:
 
         """
         # Load .env file if it exists
-        load_dotenv()
+        _load_dotenv()
+
+        # kwargs keyed case-insensitively, built once rather than scanned for every config key
+        config_kwargs = {k.upper(): v for k, v in kwargs.items()}
 
         # Helper function to get the configuration value
-        def get_config(key):
+        def get_config(key, required=True):
             """
             Args:
                 key: The config key to retrieve the value for.
+                required: Raise if the key isn't found, otherwise None is returned.
 
             Returns:
                 The value corresponding to the given config key, or None if the key was not found in any of the
@@ -340,42 +638,56 @@ class SmtpMailer:
             """
 
             # This is discouraged and only first, so I force a unit test to fail.
-            key_lower = key.lower()
-            for k, v in kwargs.items():
-                if k.lower() == key_lower:
-                    return v
+            if key in config_kwargs:
+                return config_kwargs[key]
 
-            # Check in dotenv
-            value = os.getenv(key) or os.getenv(key.lower())
+            # Check in dotenv, the environment is read live so changes after import are still picked up
+            value = os.environ.get(key) or os.environ.get(key.lower())
             if value:
                 return value
 
+            if not required:
+                return None
             raise ValueError(f"Could not find config value for {key}, cannot continue.")
 
         # Configuration values
         self.mail_server = get_config("MAIL_SERVER")
         self.mail_port = int(get_config("MAIL_PORT"))
         self.mail_use_tls = convert_bool(get_config("MAIL_USE_TLS"))
+        # port 465 is implicit TLS, the connection is encrypted from the start rather than upgraded with STARTTLS
+        self.mail_use_ssl = (
+            convert_bool(get_config("MAIL_USE_SSL", required=False))
+            or self.mail_port == 465
+        )
         self.mail_username = get_config("MAIL_USERNAME")
         self.mail_password = get_config("MAIL_PASSWORD")
         self.mail_dkim_selector = get_config("MAIL_DKIM_SELECTOR")
+        self.mail_skip_dns_validation = convert_bool(
+            get_config("MAIL_SKIP_DNS_VALIDATION", required=False)
+        )
 
-        # check for required values and raise exception if not found
-        with self._connect_to_server() as server:
-            server.quit()
+        # check the details work, the connection is then kept for the first send rather than quit and opened again
+        if verify_credentials:
+            self._get_pool().add(self._connect_to_server())
 
     def _connect_to_server(self):
         """
-        Connects to the mail server.
+        Connects to the mail server, over implicit TLS (SMTP_SSL) if `mail_use_ssl` is set, which saves the plaintext
+        EHLO and STARTTLS round trips. Envelope commands are pipelined if the server supports it.
         Returns:
             server: An instance of the server connection
         Raises:
             ValueError: If there is an error connecting to the mail server or invalid server connection details
         """
         try:
-            server = smtplib.SMTP(self.mail_server, self.mail_port)
-            if self.mail_use_tls:
-                server.starttls()
+            if self.mail_use_ssl:
+                server = PipeliningSMTP_SSL(
+                    self.mail_server, self.mail_port, context=_get_ssl_context()
+                )
+            else:
+                server = PipeliningSMTP(self.mail_server, self.mail_port)
+                if self.mail_use_tls:
+                    server.starttls()
             server.login(self.mail_username, self.mail_password)
             return server
         except:
@@ -383,23 +695,57 @@ class SmtpMailer:
                 "Invalid server connection details, please check and try again"
             )
 
-    def _send_message(self, recipients: list):
+    def _serialize_message(self) -> bytes:
+        """
+        Serializes `self.message` once, ready to send.
+
+        Returns:
+            bytes: The message with CRLF line endings.
+
+        """
+        return self.message.as_bytes(policy=_SMTP_POLICY)
+
+    def _send_message(self, recipients: list, msg: Optional[bytes] = None):
         """
-        Sends a message if provided.
+        Sends a message if provided, over one of the mailer's open connections to the server.
 
         Args:
             recipients: a list of all email addresses to send email to including bcc emails that are not in the header.
+            msg: the serialized message, as returned by `_serialize_message`. Defaults to serializing `self.message`.
 
         Returns:
             True if the message was sent successfully, otherwise raises an Exception.
         """
+        if msg is None:
+            msg = self._serialize_message()
         try:
-            with self._connect_to_server() as server:
-                server.sendmail(str(self.sender), recipients, self.message.as_string())
+            self._get_pool().send(str(self.sender), recipients, msg)
             return True
         except Exception as e:
             raise Exception(f"Failed to send message: {e}")
 
+    def _validate_reply_to(self, reply_to: str) -> bool:
+        """
+        Validates a reply-to address, including its deliverability. Checking deliverability takes a DNS lookup, so
+        addresses that passed are remembered and not checked again by this mailer.
+
+        Args:
+            reply_to (str): The reply-to email address.
+
+        Returns:
+            bool: True if the address is valid.
+
+        Raises:
+            EmailNotValidError: If the address is not valid.
+
+        """
+        if self._valid_reply_tos is None:
+            self._valid_reply_tos = set()
+        if reply_to not in self._valid_reply_tos:
+            validate_user_email(email=reply_to, check_deliverability=True)
+            self._valid_reply_tos.add(reply_to)
+        return True
+
     def _construct_base_message(
         self,
         subject: str,
@@ -424,13 +770,13 @@ class SmtpMailer:
         message["Subject"] = subject
         message["To"] = recipients
         message["Date"] = formatdate(localtime=True)
-        message["Message-Id"] = make_msgid()
+        message["Message-Id"] = make_msgid(domain=_get_msgid_domain())
         message["From"] = str(self.sender)
 
         if cc_recipients:
             message["Cc"] = cc_recipients
 
-        if reply_to and validate_user_email(email=reply_to, check_deliverability=True):
+        if reply_to and self._validate_reply_to(reply_to):
             message["Reply-To"] = reply_to
 
         return message
@@ -457,15 +803,22 @@ class SmtpMailer:
             # Expand the user path, if needed and user has used ~/path/to/file
             attachment_file_path = os.path.expanduser(attachment_file_path)
 
-            if isinstance(attachment_file_path, str) and os.path.isfile(
-                attachment_file_path
-            ):
+            # a single stat checks the path exists and is a regular file, rather than os.path.isfile then open
+            try:
+                is_file = isinstance(attachment_file_path, str) and stat.S_ISREG(
+                    os.stat(attachment_file_path).st_mode
+                )
+            except OSError:
+                is_file = False
+
+            if is_file:
+                filename = os.path.basename(attachment_file_path)
                 try:
                     with open(attachment_file_path, "rb") as attachment:
                         part = construct_mime_object(attachment_file_path, attachment)
                         part.add_header(
                             "Content-Disposition",
-                            f"attachment; filename={os.path.basename(attachment_file_path)}",
+                            f"attachment; filename={filename}",
                         )
                         self.message.attach(part)
 
@@ -525,6 +878,58 @@ class SmtpMailer:
         msg_html = MIMEText(html_content, "html")
         self.message_alt.attach(msg_html)
 
+    def _build_message(
+        self,
+        recipients: Union[str, list],
+        subject: str,
+        cc_recipients: Optional[Union[str, list]] = None,
+        bcc_recipients: Optional[Union[str, list]] = None,
+        reply_to: Optional[str] = None,
+        attachments: Optional[Union[List, str]] = None,
+        html_content: Optional = None,
+        template: Optional = None,
+        template_directory: Optional[Union[str, list]] = None,
+        **kwargs,
+    ) -> list:
+        """
+        Validates the parameters and builds the email into `self.message`, see `send_email` for the parameters.
+
+        Returns:
+            list: All email addresses to send the email to, including bcc recipients that are not in the header.
+
+        """
+
+        validate_send_email(
+            html_content, template, template_directory, subject, recipients, attachments
+        )
+
+        all_recipients = build_all_recipients_and_validate(
+            recipients, cc_recipients, bcc_recipients, validate=self.validate_recipients
+        )
+
+        recipients_str = recipients_to_str(recipients)
+        cc_recipients_str = recipients_to_str(cc_recipients)
+
+        self.message = self._construct_base_message(
+            recipients=recipients_str,
+            subject=subject,
+            cc_recipients=cc_recipients_str,
+            reply_to=reply_to,
+        )
+
+        html_content = make_html_content(
+            html_content,
+            template,
+            template_directory,
+            **kwargs,
+        )
+
+        self._make_plain_message(html_content)
+        self._make_html_message(html_content)
+        self._add_attachments(attachments)
+
+        return all_recipients
+
     def send_email(
         self,
         recipients: Union[str, list],
@@ -565,6 +970,7 @@ class SmtpMailer:
                 * When a `template` str is passed with no directory and no `template_directory` is supplied.
                 * Blank subject field
                 * Empty str or list of `recipients`
+                * The sender domain's DNS records failed a background ("async") validation
 
         Returns:
             True if the email was sent successfully, otherwise raises an Exception.
@@ -572,33 +978,273 @@ class SmtpMailer:
 
         """
 
-        validate_send_email(
-            html_content, template, template_directory, subject, recipients
+        return self._build_and_send(
+            recipients,
+            subject,
+            cc_recipients=cc_recipients,
+            bcc_recipients=bcc_recipients,
+            reply_to=reply_to,
+            attachments=attachments,
+            html_content=html_content,
+            template=template,
+            template_directory=template_directory,
+            **kwargs,
         )
 
-        all_recipients = build_all_recipients_and_validate(
-            recipients, cc_recipients, bcc_recipients
-        )
+    async def send_email_async(
+        self,
+        recipients: Union[str, list],
+        subject: str,
+        cc_recipients: Optional[Union[str, list]] = None,
+        bcc_recipients: Optional[Union[str, list]] = None,
+        reply_to: Optional[str] = None,
+        attachments: Optional[Union[List, str]] = None,
+        html_content: Optional = None,
+        template: Optional = None,
+        template_directory: Optional[Union[str, list]] = None,
+        **kwargs,
+    ) -> bool:
+        """
+        Sends an email like `send_email` without blocking the event loop. The email is built and sent on one of the
+        mailer's worker threads over its pooled connections, so many emails can be awaited together with
+        `asyncio.gather` and one email's network round trips overlap with building the next.
 
-        recipients_str = recipients_to_str(recipients)
-        cc_recipients_str = recipients_to_str(cc_recipients)
+        Args:
+            The same as `send_email`.
 
-        self.message = self._construct_base_message(
-            recipients=recipients_str,
-            subject=subject,
-            cc_recipients=cc_recipients_str,
-            reply_to=reply_to,
-        )
+        Raises:
+            Exception: The same as `send_email`.
 
-        html_content = make_html_content(
-            html_content,
-            template,
-            template_directory,
+        Returns:
+            True if the email was sent successfully, otherwise raises an Exception.
+
+        Example:
+            >>> async with SmtpMailer("foo@bar.com", "Foo Bar") as mailer:
+            ...     await asyncio.gather(
+            ...         mailer.send_email_async("bar@baz.com", "Hello Bar", html_content="<h1>Hello Bar</h1>"),
+            ...         mailer.send_email_async("baz@bar.com", "Hello Baz", html_content="<h1>Hello Baz</h1>"),
+            ...     )
+            [True, True]
+
+        """
+        send = functools.partial(
+            self._build_and_send,
+            recipients,
+            subject,
+            cc_recipients=cc_recipients,
+            bcc_recipients=bcc_recipients,
+            reply_to=reply_to,
+            attachments=attachments,
+            html_content=html_content,
+            template=template,
+            template_directory=template_directory,
             **kwargs,
         )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(), send
+        )
 
-        self._make_plain_message(html_content)
-        self._make_html_message(html_content)
-        self._add_attachments(attachments)
+    def _build_and_send(self, *args, **kwargs) -> bool:
+        """
+        Builds and sends an email. The mailer holds a single message, so building and serializing it is done under a
+        lock, while sending the serialized bytes runs concurrently with other threads.
+        """
+        with self._build_lock:
+            all_recipients = self._build_message(*args, **kwargs)
+            msg = self._serialize_message()
+
+        self._wait_for_auth_validation()
+        return self._send_message(all_recipients, msg)
+
+    def send_many(
+        self,
+        messages: List[dict],
+        max_connections: Optional[int] = None,
+        abort_threshold: Optional[float] = 1 / 3,
+    ) -> list:
+        """
+        Sends many emails, reusing a pool of server connections rather than connecting and authenticating for every
+        email. Emails are built one after another and sent concurrently over the mailer's connections, up to
+        `max_connections` at once.
+
+        Args:
+            messages: A list of dicts, each holding the keyword arguments of `send_email` for one email.
+            max_connections: Optional. Sends over a separate pool of this many connections, closed once the emails are
+                sent. Defaults to the mailer's own connections.
+            abort_threshold: Optional. Once at least 30 emails have been sent to the server, the rest aren't sent if
+                this fraction of them were refused, and the mailer's connections are closed. Emails that fail to build,
+                i.e. with an invalid address, aren't counted. None sends every email regardless. Defaults to 1/3.
+
+        Returns:
+            list: The result for each message, in order. True if the email was sent, otherwise the exception raised
+                while building or sending it. A failed email does not stop the rest being sent, unless the
+                `abort_threshold` is reached.
+
+        Raises:
+            BulkSendAborted: If the `abort_threshold` was reached, holding the results so far.
+
+        Example:
+            >>> mailer.send_many([
+            ...     {"recipients": "foo@bar.com", "subject": "Hello Foo", "html_content": "<h1>Hello Foo</h1>"},
+            ...     {"recipients": "bar@baz.com", "subject": "Hello Bar", "html_content": "<h1>Hello Bar</h1>"},
+            ... ])
+            [True, True]
+
+        """
+        self._wait_for_auth_validation()
+
+        results = [None] * len(messages)
+        futures = {}
+        tally_lock = threading.Lock()
+        tally = {"tried": 0, "failed": 0}
+        aborted = threading.Event()
+
+        def record_sent(future):
+            if future.cancelled():
+                return
+            with tally_lock:
+                tally["tried"] += 1
+                tally["failed"] += future.exception() is not None
+                if (
+                    abort_threshold is not None
+                    and tally["tried"] >= _ABORT_MIN_MESSAGES
+                    and tally["failed"] >= abort_threshold * tally["tried"]
+                ):
+                    aborted.set()
+
+        if max_connections is None:
+            pool = self._get_pool()
+        else:
+            pool = SmtpConnectionPool(
+                self._connect_to_server,
+                size=max_connections,
+                max_messages_per_connection=self.max_messages_per_connection,
+            )
+
+        try:
+            with ThreadPoolExecutor(max_workers=pool.size) as executor:
+                for idx, message_kwargs in enumerate(messages):
+                    if aborted.is_set():
+                        break
+                    try:
+                        with self._build_lock:
+                            all_recipients = self._build_message(**message_kwargs)
+                            msg = self._serialize_message()
+                    except Exception as e:
+                        results[idx] = e
+                        continue
+                    future = executor.submit(
+                        pool.send, str(self.sender), all_recipients, msg
+                    )
+                    future.add_done_callback(record_sent)
+                    futures[future] = idx
+
+                cancelled = False
+                for future, idx in futures.items():
+                    if aborted.is_set() and not cancelled:
+                        # emails still queued behind the running sends are dropped
+                        for pending in futures:
+                            pending.cancel()
+                        cancelled = True
+                    if future.cancelled():
+                        continue
+                    try:
+                        future.result()
+                        results[idx] = True
+                    except Exception as e:
+                        results[idx] = Exception(f"Failed to send message: {e}")
+        finally:
+            if max_connections is not None:
+                pool.close_all()
+            elif aborted.is_set():
+                self.close()
+
+        if aborted.is_set():
+            raise BulkSendAborted(
+                f"Sending aborted after {tally['failed']} of {tally['tried']} emails were refused",
+                results,
+            )
+        return results
+
+    def send_email_bulk(
+        self,
+        recipient_batches: List[Union[str, list]],
+        subject: str,
+        reply_to: Optional[str] = None,
+        attachments: Optional[Union[List, str]] = None,
+        html_content: Optional = None,
+        template: Optional = None,
+        template_directory: Optional[Union[str, list]] = None,
+        **kwargs,
+    ) -> list:
+        """
+        Sends the same email to batches of recipients, i.e. a newsletter. The email is built and serialized once and
+        the same bytes are sent to every batch, concurrently over the mailer's connections. Recipients aren't listed
+        in the email's headers, each batch only receives it as envelope recipients (like bcc).
+
+        Args:
+            recipient_batches: A list of batches, each either a single email address or a list of email addresses.
+            subject: The subject of the email.
+            reply_to: Optional. The reply-to email address.
+            attachments: Optional. Either a single attachment file path or a list of attachment file paths.
+            html_content: Optional. The HTML content of the email, not needed if you are using a template.
+            template: Optional. The template file path.
+            template_directory: Optional. Either a single template directory or a list of template directories.
+            **kwargs: Additional keyword arguments for the jinja template if needed
+
+        Returns:
+            list: The result for each batch, in order. True if the email was sent, otherwise the exception raised
+                while sending it. A failed batch does not stop the rest being sent.
+
+        Raises:
+            ValueError: If no batches are provided, or a batch is empty.
+            EmailNotValidError: If any of the email addresses are not valid.
+
+        Example:
+            >>> mailer.send_email_bulk(
+            ...     [["foo@bar.com", "bar@baz.com"], ["baz@bar.com"]],
+            ...     subject="Newsletter",
+            ...     html_content="<h1>News</h1>",
+            ... )
+            [True, True]
+
+        """
+        if not recipient_batches:
+            raise ValueError("No recipient batches provided")
+
+        batches = [
+            build_all_recipients_and_validate(batch, validate=self.validate_recipients)
+            for batch in recipient_batches
+        ]
+
+        with self._build_lock:
+            self._build_message(
+                recipient_batches[0],
+                subject,
+                reply_to=reply_to,
+                attachments=attachments,
+                html_content=html_content,
+                template=template,
+                template_directory=template_directory,
+                **kwargs,
+            )
+            self.message.replace_header("To", "undisclosed-recipients:;")
+            raw_message = self._serialize_message()
+
+        self._wait_for_auth_validation()
+
+        pool = self._get_pool()
+        results = []
+        with ThreadPoolExecutor(max_workers=pool.size) as executor:
+            futures = [
+                executor.submit(pool.send, str(self.sender), batch, raw_message)
+                for batch in batches
+            ]
+            for future in futures:
+                try:
+                    future.result()
+                    results.append(True)
+                except Exception as e:
+                    results.append(Exception(f"Failed to send message: {e}"))
 
-        return self._send_message(all_recipients)
+        return results
@@ -0,0 +1,259 @@
+import queue
+import smtplib
+import socket
+import threading
+import time
+from typing import Callable, List, Union
+
+# transient reply codes a send is retried on, the server is busy, rate limiting or shutting the connection down, and
+# may well accept the message shortly. 5xx replies are permanent failures (RFC 5321) so aren't retried
+_TRANSIENT_CODES = frozenset((421, 450, 451, 452))
+
+# seconds a pooled connection's socket sits idle before TCP keepalive probes start, so NAT gateways and firewalls don't
+# silently drop connections waiting in the pool
+_TCP_KEEPIDLE = 30
+
+
+def _enable_keepalive(server: smtplib.SMTP):
+    """
+    Turns on TCP keepalive for the connection's socket, the idle time is only set on platforms that support it.
+    """
+    sock = getattr(server, "sock", None)
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, _TCP_KEEPIDLE)
+    except OSError:
+        pass
+
+
+class _PooledConnection:
+    """
+    An authenticated SMTP connection held by `SmtpConnectionPool`, along with the bookkeeping needed to recycle it.
+    """
+
+    __slots__ = ("server", "messages_sent", "last_used")
+
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+    def close(self):
+        """
+        Closes the connection, politely if the server is still there.
+        """
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            self.server.close()
+
+
+class SmtpConnectionPool:
+    """
+    A thread-safe pool of authenticated SMTP connections. Opening a connection costs a TCP connect, STARTTLS and AUTH,
+    which takes far longer than sending a message, so connections are kept open and reused across messages.
+
+    Connections are opened lazily up to `size`, recycled after `max_messages_per_connection` messages (servers often
+    limit the messages per session) and checked with a NOOP before reuse if they've been idle for longer than
+    `keepalive_interval` seconds. Sends refused with a transient 4xx reply are retried with exponential backoff.
+
+    Example:
+        >>> def connect():
+        ...     server = smtplib.SMTP("mail.example.com", 587)
+        ...     server.starttls()
+        ...     server.login("username", "password")
+        ...     return server
+        >>> with SmtpConnectionPool(connect, size=4) as pool:
+        ...     pool.send("foo@example.com", ["bar@example.com"], message.as_string())
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], smtplib.SMTP],
+        size: int = 4,
+        max_messages_per_connection: int = 100,
+        keepalive_interval: float = 30,
+        retries: int = 2,
+        retry_backoff: float = 1,
+    ):
+        """
+        Args:
+            connect (Callable[[], smtplib.SMTP]): Opens a new, authenticated connection to the mail server.
+            size (int): The maximum number of open connections. Defaults to 4.
+            max_messages_per_connection (int): The number of messages sent over a connection before it's replaced.
+                Defaults to 100.
+            keepalive_interval (float): Idle connections older than this many seconds are checked with a NOOP before
+                being reused. Defaults to 30.
+            retries (int): The number of times a send refused with a transient reply (421, 450, 451 or 452) is
+                retried. Defaults to 2.
+            retry_backoff (float): Seconds to wait before the first retry, doubled for each retry after. Defaults
+                to 1.
+
+        """
+        if size < 1:
+            raise ValueError("The pool size must be at least 1")
+
+        self._connect = connect
+        self.size = size
+        self.max_messages_per_connection = max_messages_per_connection
+        self.keepalive_interval = keepalive_interval
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close_all()
+
+    def _is_alive(self, connection: _PooledConnection) -> bool:
+        """
+        Checks an idle connection is still usable, only connections idle for longer than the keepalive interval are
+        sent a NOOP.
+        """
+        if time.monotonic() - connection.last_used < self.keepalive_interval:
+            return True
+        try:
+            return connection.server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def acquire(self) -> _PooledConnection:
+        """
+        Takes a connection from the pool, opening a new one if none are idle. Blocks while all `size` connections are
+        in use.
+
+        Returns:
+            _PooledConnection: The connection, which must be handed back with `release`.
+
+        Raises:
+            ValueError: If the pool is closed, or a new connection can't be opened.
+
+        """
+        if self._closed:
+            raise ValueError("The connection pool is closed")
+
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    connection = self._idle.get_nowait()
+                except queue.Empty:
+                    server = self._connect()
+                    _enable_keepalive(server)
+                    return _PooledConnection(server)
+                if self._is_alive(connection):
+                    return connection
+                connection.close()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, connection: _PooledConnection, discard: bool = False):
+        """
+        Hands a connection back to the pool.
+
+        Args:
+            connection (_PooledConnection): The connection taken with `acquire`.
+            discard (bool): Close the connection rather than reuse it, i.e. after an error. Defaults to False.
+
+        """
+        try:
+            connection.last_used = time.monotonic()
+            if (
+                discard
+                or self._closed
+                or connection.messages_sent >= self.max_messages_per_connection
+            ):
+                connection.close()
+            else:
+                self._idle.put(connection)
+        finally:
+            self._slots.release()
+
+    def add(self, server: smtplib.SMTP):
+        """
+        Hands an already open, authenticated connection to the pool, i.e. one opened to check the login details, so
+        the next send uses it rather than connecting again. The connection is closed if the pool is closed or already
+        holds `size` idle connections.
+
+        Args:
+            server (smtplib.SMTP): The open connection.
+
+        """
+        connection = _PooledConnection(server)
+        if self._closed or self._idle.qsize() >= self.size:
+            connection.close()
+            return
+        _enable_keepalive(server)
+        self._idle.put(connection)
+
+    def send(
+        self, from_addr: str, to_addrs: List[str], msg: Union[str, bytes]
+    ) -> dict:
+        """
+        Sends a message over a pooled connection. If the server has dropped the connection, the message is retried once
+        over a new connection. If the server refuses it with a transient reply, it's retried up to `retries` times,
+        waiting `retry_backoff` seconds before the first retry and twice as long before each one after.
+
+        Args:
+            from_addr (str): The envelope sender.
+            to_addrs (List[str]): All envelope recipients, including bcc recipients.
+            msg (Union[str, bytes]): The serialized message.
+
+        Returns:
+            dict: The recipients that were refused, see `smtplib.SMTP.sendmail`.
+
+        Raises:
+            smtplib.SMTPException: If the message can't be sent.
+
+        """
+        reconnected = False
+        retried = 0
+        while True:
+            connection = self.acquire()
+            try:
+                refused = connection.server.sendmail(from_addr, to_addrs, msg)
+            except smtplib.SMTPServerDisconnected:
+                self.release(connection, discard=True)
+                if reconnected:
+                    raise
+                reconnected = True
+            except smtplib.SMTPResponseException as e:
+                # smtplib resets the transaction after a refused reply, so the connection is still usable, unless the
+                # reply was a 421 which closes it
+                self.release(connection, discard=e.smtp_code == 421)
+                if e.smtp_code not in _TRANSIENT_CODES or retried >= self.retries:
+                    raise
+                time.sleep(self.retry_backoff * 2**retried)
+                retried += 1
+            except smtplib.SMTPRecipientsRefused:
+                self.release(connection)
+                raise
+            except BaseException:
+                self.release(connection, discard=True)
+                raise
+            else:
+                connection.messages_sent += 1
+                self.release(connection)
+                return refused
+
+    def close_all(self):
+        """
+        Closes every idle connection and stops the pool handing out new ones, connections in use are closed as they
+        are released.
+        """
+        self._closed = True
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            connection.close()
@@ -0,0 +1,59 @@
+"""
+Compiles Jinja templates ahead of time into the bytecode cache, i.e. while deploying, so worker processes don't
+compile them on their first send.
+
+Usage:
+    python -m smtpymailer.precompile ./templates [./more_templates ...]
+"""
+import argparse
+import sys
+from typing import List, Optional, Sequence, Union
+
+from smtpymailer.html_parse import create_jinja_environment
+
+
+def precompile_templates(
+    template_paths: Union[str, List[str]], extensions: Sequence[str] = ("html",)
+) -> List[str]:
+    """
+    Compiles every template in the template paths, writing their bytecode to the bytecode cache.
+
+    Args:
+        template_paths (Union[str, List[str]]): A path or list of paths where the templates can be found.
+        extensions (Sequence[str]): The file extensions of the templates to compile. Defaults to ("html",).
+
+    Returns:
+        List[str]: The names of the compiled templates.
+
+    Raises:
+        jinja2.TemplateSyntaxError: If a template can't be compiled.
+
+    """
+    env = create_jinja_environment(template_paths)
+    names = env.list_templates(extensions=list(extensions))
+    for name in names:
+        env.get_template(name)
+    return names
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m smtpymailer.precompile",
+        description="Compile Jinja templates into the smtpymailer bytecode cache.",
+    )
+    parser.add_argument("template_paths", nargs="+", help="template directories")
+    parser.add_argument(
+        "--extensions",
+        nargs="+",
+        default=["html"],
+        help="file extensions of the templates to compile (default: html)",
+    )
+    args = parser.parse_args(argv)
+
+    names = precompile_templates(args.template_paths, args.extensions)
+    print(f"Compiled {len(names)} template(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
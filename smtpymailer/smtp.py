@@ -0,0 +1,115 @@
+import re
+import smtplib
+from typing import List, Sequence, Union
+
+_LEADING_PERIOD_RE = re.compile(rb"(?m)^\.")
+_LINE_ENDING_RE = re.compile(r"\r\n|\n|\r(?!\n)")
+
+
+def _options(options: Sequence[str]) -> str:
+    """Formats ESMTP options to follow a MAIL or RCPT argument."""
+    return " " + " ".join(options) if options else ""
+
+
+class PipeliningMixin:
+    """
+    Sends the MAIL, RCPT and DATA commands of `sendmail` in one batch when the server advertises PIPELINING
+    (RFC 2920), then reads their replies in order. This takes one round trip for the envelope instead of one per
+    command, which is two plus one per recipient.
+
+    Servers without PIPELINING, and SMTPUTF8 messages, are sent with the standard `smtplib.SMTP.sendmail`.
+    """
+
+    def sendmail(
+        self,
+        from_addr: str,
+        to_addrs: Union[str, List[str]],
+        msg: Union[str, bytes],
+        mail_options: Sequence[str] = (),
+        rcpt_options: Sequence[str] = (),
+    ) -> dict:
+        """
+        Sends a message, see `smtplib.SMTP.sendmail` for the arguments, return value and errors.
+        """
+        self.ehlo_or_helo_if_needed()
+        if not self.has_extn("pipelining") or any(
+            option.lower() == "smtputf8" for option in mail_options
+        ):
+            return super().sendmail(from_addr, to_addrs, msg, mail_options, rcpt_options)
+
+        if isinstance(msg, str):
+            msg = _LINE_ENDING_RE.sub(smtplib.CRLF, msg).encode("ascii")
+        if isinstance(to_addrs, str):
+            to_addrs = [to_addrs]
+
+        esmtp_opts = list(mail_options)
+        if self.has_extn("size"):
+            esmtp_opts.insert(0, "size=%d" % len(msg))
+
+        commands = [
+            "mail FROM:%s%s" % (smtplib.quoteaddr(from_addr), _options(esmtp_opts))
+        ]
+        commands.extend(
+            "rcpt TO:%s%s" % (smtplib.quoteaddr(addr), _options(rcpt_options))
+            for addr in to_addrs
+        )
+        commands.append("data")
+        self.send("".join(command + smtplib.CRLF for command in commands))
+
+        # every reply is read before acting on any, so the connection stays in step with the server
+        mail_reply = self.getreply()
+        rcpt_replies = [self.getreply() for _ in to_addrs]
+        data_code, data_resp = self.getreply()
+
+        senderrs = {
+            addr: reply
+            for addr, reply in zip(to_addrs, rcpt_replies)
+            if reply[0] not in (250, 251)
+        }
+        envelope_ok = mail_reply[0] == 250 and len(senderrs) < len(to_addrs)
+
+        if data_code == 354 and not envelope_ok:
+            # the server is waiting for a message nobody will receive, end it empty
+            self.send(b"." + smtplib.bCRLF)
+            self.getreply()
+
+        if mail_reply[0] != 250:
+            self._close_or_reset(mail_reply[0])
+            raise smtplib.SMTPSenderRefused(mail_reply[0], mail_reply[1], from_addr)
+        if any(code == 421 for code, _ in rcpt_replies):
+            self.close()
+            raise smtplib.SMTPRecipientsRefused(senderrs)
+        if not envelope_ok:
+            self._rset()
+            raise smtplib.SMTPRecipientsRefused(senderrs)
+        if data_code != 354:
+            self._close_or_reset(data_code)
+            raise smtplib.SMTPDataError(data_code, data_resp)
+
+        data = _LEADING_PERIOD_RE.sub(b"..", msg)
+        if data[-2:] != smtplib.bCRLF:
+            data += smtplib.bCRLF
+        self.send(data + b"." + smtplib.bCRLF)
+
+        code, resp = self.getreply()
+        if code != 250:
+            self._close_or_reset(code)
+            raise smtplib.SMTPDataError(code, resp)
+        return senderrs
+
+    def _close_or_reset(self, code: int):
+        """
+        Closes the connection if the server is shutting it down (421), otherwise resets the transaction.
+        """
+        if code == 421:
+            self.close()
+        else:
+            self._rset()
+
+
+class PipeliningSMTP(PipeliningMixin, smtplib.SMTP):
+    """An `smtplib.SMTP` connection that pipelines the envelope commands when the server supports it."""
+
+
+class PipeliningSMTP_SSL(PipeliningMixin, smtplib.SMTP_SSL):
+    """An `smtplib.SMTP_SSL` connection that pipelines the envelope commands when the server supports it."""
@@ -1,10 +1,11 @@
 import os
-from email import encoders
+from email.encoders import encode_noop
 from email.mime.application import MIMEApplication
 from email.mime.audio import MIMEAudio
 from email.mime.base import MIMEBase
 from email.mime.image import MIMEImage
 from email.mime.text import MIMEText
+from functools import lru_cache
 from mimetypes import guess_type
 from pathlib import Path
 from typing import Optional, Union, Tuple
@@ -12,7 +13,91 @@ from urllib.parse import urlparse
 
 import validators
 
-from smtpymailer.validation import validate_user_email
+from smtpymailer.validation import validate_email_format, validate_user_email
+
+# pybase64 is an optional, SIMD accelerated drop-in for the stdlib base64 module
+try:
+    import pybase64 as _base64
+except ImportError:
+    import base64 as _base64
+
+# Attachments are read and base64 encoded this many bytes at a time, a multiple of 57 so each chunk encodes to whole
+# 76 character lines
+_ATTACHMENT_CHUNK_SIZE = 57 * 1024
+
+# MIME classes for the binary main types, looked up by main type rather than through a chain of comparisons
+_BINARY_MIME_CLASSES = {
+    "application": MIMEApplication,
+    "image": MIMEImage,
+    "audio": MIMEAudio,
+}
+
+# Extended mapping of file extensions to MIME types, built once at import
+_MIME_TYPES = {
+    # Document types
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'pdf': 'application/pdf',
+    'txt': 'text/plain',
+    'doc': 'application/msword',
+    'ppt': 'application/vnd.ms-powerpoint',
+    'pptx': 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+    'xls': 'application/vnd.ms-excel',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'odt': 'application/vnd.oasis.opendocument.text',
+    'ods': 'application/vnd.oasis.opendocument.spreadsheet',
+    'odp': 'application/vnd.oasis.opendocument.presentation',
+    'rtf': 'application/rtf',
+    'csv': 'text/csv',
+    'html': 'text/html',
+    'xml': 'application/xml',
+    # Image types
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+    'gif': 'image/gif',
+    'bmp': 'image/bmp',
+    'svg': 'image/svg+xml',
+    'tiff': 'image/tiff',
+    'webp': 'image/webp',
+    # Video types
+    'mp4': 'video/mp4',
+    'avi': 'video/x-msvideo',
+    'mkv': 'video/x-matroska',
+    'mov': 'video/quicktime',
+    'wmv': 'video/x-ms-wmv',
+    'flv': 'video/x-flv',
+    'webm': 'video/webm',
+    # Audio types
+    'mp3': 'audio/mpeg',
+    'wav': 'audio/wav',
+    'ogg': 'audio/ogg',
+    'flac': 'audio/flac',
+    'aac': 'audio/aac',
+    'm4a': 'audio/mp4',
+    'wma': 'audio/x-ms-wma',
+    # Archive types
+    'zip': 'application/zip',
+    'rar': 'application/x-rar-compressed',
+    '7z': 'application/x-7z-compressed',
+    'tar': 'application/x-tar',
+    'gz': 'application/gzip',
+    'bz2': 'application/x-bzip2',
+    # Executable and script types
+    'exe': 'application/x-msdownload',
+    'sh': 'application/x-sh',
+    'bat': 'application/x-bat',
+    'py': 'text/x-python',
+    'jar': 'application/java-archive',
+    # Font types
+    'woff': 'font/woff',
+    'woff2': 'font/woff2',
+    'ttf': 'font/ttf',
+    'otf': 'font/otf',
+    # Other
+    'json': 'application/json',
+    'md': 'text/markdown',
+}
+
 
 def is_get_local_file(file_path: str) -> Tuple[bool, Union[str, None]]:
     """
@@ -35,9 +120,11 @@ def is_get_local_file(file_path: str) -> Tuple[bool, Union[str, None]]:
         return False, None
 
 
+@lru_cache(maxsize=1024)
 def is_resolvable(url):
     """
-    Check if a URL is resolvable using validators library.
+    Check if a URL is resolvable using validators library. Results are cached, the same image URLs are checked for
+    every email.
 
     Parameters:
         url (str): The URL to check if it is resolvable.
@@ -52,6 +139,55 @@ def is_resolvable(url):
     except Exception:
         return False
 
+def b64encode_to_str(data: bytes) -> str:
+    """
+    Base64 encodes the given data, using pybase64 if it is installed.
+
+    Args:
+        data (bytes): The data to encode.
+
+    Returns:
+        str: The base64 encoded data as an ASCII string.
+
+    """
+    if hasattr(_base64, "b64encode_as_string"):
+        return _base64.b64encode_as_string(data)
+    return _base64.b64encode(data).decode("ascii")
+
+
+def encode_base64(msg: MIMEBase):
+    """
+    Encodes the message's payload in base64 and sets the Content-Transfer-Encoding header. A drop-in for
+    `email.encoders.encode_base64` (usable as a MIME class `_encoder`), the stdlib version encodes line by line in
+    Python where this uses pybase64's C implementation if it is installed.
+
+    Args:
+        msg (MIMEBase): The message whose payload should be encoded.
+
+    """
+    orig = msg.get_payload(decode=True)
+    msg.set_payload(_base64.encodebytes(orig).decode("ascii"))
+    msg["Content-Transfer-Encoding"] = "base64"
+
+
+def encode_file_base64(file) -> str:
+    """
+    Base64 encodes a file object's remaining content a chunk at a time, so the raw file is never held in memory
+    alongside its encoded copy. The output matches `encode_base64`, as each chunk encodes to whole lines.
+
+    Args:
+        file (file object): The binary file object to read from.
+
+    Returns:
+        str: The base64 encoded content, split into 76 character lines.
+
+    """
+    return "".join(
+        _base64.encodebytes(chunk).decode("ascii")
+        for chunk in iter(lambda: file.read(_ATTACHMENT_CHUNK_SIZE), b"")
+    )
+
+
 def find_project_root(
     marker: Optional[Union[str, list]] = None, file_path: Optional = None
 ) -> Optional[Path]:
@@ -123,13 +259,22 @@ def recipients_to_str(recipients):
     Converts the recipients list to a string representation.
 
     Args:
-        recipients: A list of recipients.
+        recipients: A list of recipients, or a single recipient. Recipients that aren't strings, i.e. `Contact`
+            objects, are converted with `str`.
 
     Returns:
         A string representation of the recipients list, with each recipient separated by a comma and space.
         If the recipients list is empty, an empty string is returned.
     """
-    return ", ".join(ensure_list(recipients)) if recipients else ""
+    if not recipients:
+        return ""
+    # a single address, or an already joined string, is used as is
+    if isinstance(recipients, str):
+        return recipients
+    return ", ".join(
+        recipient if isinstance(recipient, str) else str(recipient)
+        for recipient in ensure_list(recipients)
+    )
 
 
 def convert_bool(val):
@@ -145,7 +290,9 @@ def convert_bool(val):
     return val in ["True", "true", 1, "1", "Yes", "yes", "Y", "y", True]
 
 
-def validate_and_extend(all_recipients: list, recipient_type: Union[str, list]):
+def validate_and_extend(
+    all_recipients: list, recipient_type: Union[str, list], validate: bool = True
+):
     """
     Validates and extends the all_recipients list with validated email addresses. If a recipient type is provided
     as a string or list, it is first normalized into a list format. Each email address in this list is then validated.
@@ -154,6 +301,8 @@ def validate_and_extend(all_recipients: list, recipient_type: Union[str, list]):
     Args:
         all_recipients (list): The main list of all recipients that will be extended with validated emails.
         recipient_type (Union[str, list]): A string or list of email addresses to validate and add to all_recipients.
+        validate (bool): Fully validate each email address. If False only the basic format is checked, which is much
+            cheaper for lists that are already known to be clean. Defaults to True.
 
     Raises:
         EmailNotValidError: If any of the email addresses in recipient_type is not valid.
@@ -162,8 +311,9 @@ def validate_and_extend(all_recipients: list, recipient_type: Union[str, list]):
 
     if recipient_type:
         recipient_list = ensure_list(recipient_type)
+        check = validate_user_email if validate else validate_email_format
         for email in recipient_list:
-            if validate_user_email(email):
+            if check(email):
                 all_recipients.append(email)
 
 
@@ -171,6 +321,7 @@ def build_all_recipients_and_validate(
     recipients: Union[str, list],
     cc_recipients: Optional[Union[str, list]] = None,
     bcc_recipients: Optional[Union[str, list]] = None,
+    validate: bool = True,
 ):
     """
     Constructs a complete list of validated email addresses for an email, including To, CC, and BCC recipients.
@@ -184,9 +335,11 @@ def build_all_recipients_and_validate(
             the 'CC' recipients.
         bcc_recipients (Optional[Union[str, list]]): Optionally, a string or list of email addresses for
             the 'BCC' recipients.
+        validate (bool): Fully validate each email address, or only check the basic format if False. Defaults to True.
 
     Returns:
-        list: A list of all validated email addresses across the To, CC, and BCC fields.
+        list: A list of all validated email addresses across the To, CC, and BCC fields, in order and without
+            duplicates, so an address listed more than once is only sent the email once.
 
     Raises:
         EmailNotValidError: If any of the provided email addresses are not valid.
@@ -196,89 +349,35 @@ def build_all_recipients_and_validate(
 
     all_recipients = []
     for recipient_type in [recipients, cc_recipients, bcc_recipients]:
-        validate_and_extend(all_recipients, recipient_type)
+        validate_and_extend(all_recipients, recipient_type, validate)
 
-    return all_recipients
+    return list(dict.fromkeys(all_recipients))
 
 def guess_type_by_extension(filename):
     extension = filename.split('.')[-1].lower()
 
-    # Extended mapping of file extensions to MIME types
-    mime_mapping = {
-        # Document types
-        'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-        'pdf': 'application/pdf',
-        'txt': 'text/plain',
-        'doc': 'application/msword',
-        'ppt': 'application/vnd.ms-powerpoint',
-        'pptx': 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
-        'xls': 'application/vnd.ms-excel',
-        'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        'odt': 'application/vnd.oasis.opendocument.text',
-        'ods': 'application/vnd.oasis.opendocument.spreadsheet',
-        'odp': 'application/vnd.oasis.opendocument.presentation',
-        'rtf': 'application/rtf',
-        'csv': 'text/csv',
-        'html': 'text/html',
-        'xml': 'application/xml',
-        # Image types
-        'jpg': 'image/jpeg',
-        'jpeg': 'image/jpeg',
-        'png': 'image/png',
-        'gif': 'image/gif',
-        'bmp': 'image/bmp',
-        'svg': 'image/svg+xml',
-        'tiff': 'image/tiff',
-        'webp': 'image/webp',
-        # Video types
-        'mp4': 'video/mp4',
-        'avi': 'video/x-msvideo',
-        'mkv': 'video/x-matroska',
-        'mov': 'video/quicktime',
-        'wmv': 'video/x-ms-wmv',
-        'flv': 'video/x-flv',
-        'webm': 'video/webm',
-        # Audio types
-        'mp3': 'audio/mpeg',
-        'wav': 'audio/wav',
-        'ogg': 'audio/ogg',
-        'flac': 'audio/flac',
-        'aac': 'audio/aac',
-        'm4a': 'audio/mp4',
-        'wma': 'audio/x-ms-wma',
-        # Archive types
-        'zip': 'application/zip',
-        'rar': 'application/x-rar-compressed',
-        '7z': 'application/x-7z-compressed',
-        'tar': 'application/x-tar',
-        'gz': 'application/gzip',
-        'bz2': 'application/x-bzip2',
-        # Executable and script types
-        'exe': 'application/x-msdownload',
-        'sh': 'application/x-sh',
-        'bat': 'application/x-bat',
-        'py': 'text/x-python',
-        'jar': 'application/java-archive',
-        # Font types
-        'woff': 'font/woff',
-        'woff2': 'font/woff2',
-        'ttf': 'font/ttf',
-        'otf': 'font/otf',
-        # Other
-        'json': 'application/json',
-        'md': 'text/markdown',
-    }
-
     # Lookup MIME type based on extension
-    mime_type = mime_mapping.get(extension)
-    return mime_type
+    return _guess_type_for_extension(extension)
+
+
+@lru_cache(maxsize=256)
+def _guess_type_for_extension(extension: str) -> Optional[str]:
+    """
+    Looks up the MIME type for a lowercased file extension, in `_MIME_TYPES` first and then the system's mimetypes
+    tables, including the commonly used non-standard types. Results are cached per extension, as the same few
+    attachment types are sent again and again.
+    """
+    return (
+        _MIME_TYPES.get(extension)
+        or guess_type(f"file.{extension}", strict=False)[0]
+    )
 
 def construct_mime_object(path: str, attachment):
     """
     This function takes a file path and an attachment object, and constructs a MIME object
     that represents the attachment. This is particularly useful when dealing with different
     types of file attachments in email sending, as the constructed MIME object can be directly
-    attached to the email object.
+    attached to the email object. Files of an unknown type are attached as application/octet-stream.
 
     Args:
         path (str): The path of the file to be attached. This path is used to guess the MIME type
@@ -301,23 +400,23 @@ def construct_mime_object(path: str, attachment):
             is set to designate it as an attachment with filename "example.txt".
     """
 
-    mime_type = guess_type_by_extension(path)
+    mime_type = guess_type_by_extension(path) or "application/octet-stream"
     mime_main, mime_sub = mime_type.split("/")
 
-    if mime_main == "application":
-        mime_part = MIMEApplication(attachment.read(), _subtype=mime_sub)
+    # The binary MIME classes are built empty with a no-op encoder, the file is then encoded straight into the payload
+    mime_class = _BINARY_MIME_CLASSES.get(mime_main)
+    if mime_class is not None:
+        mime_part = mime_class(b"", _subtype=mime_sub, _encoder=encode_noop)
     elif mime_main == "text":
         mime_part = MIMEText(
             attachment.read().decode("utf-8"), _subtype=mime_sub, _charset="utf-8"
         )
-    elif mime_main == "image":
-        mime_part = MIMEImage(attachment.read(), _subtype=mime_sub)
-    elif mime_main == "audio":
-        mime_part = MIMEAudio(attachment.read(), _subtype=mime_sub)
     else:
         mime_part = MIMEBase(mime_main, mime_sub)
-        mime_part.set_payload(attachment.read())
-        encoders.encode_base64(mime_part)
+
+    if mime_main != "text":
+        mime_part.set_payload(encode_file_base64(attachment))
+        mime_part["Content-Transfer-Encoding"] = "base64"
 
     mime_part.add_header("Content-Disposition", "attachment", filename="example.txt")
     return mime_part
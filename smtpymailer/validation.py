@@ -3,11 +3,52 @@ import binascii
 import ipaddress
 import re
 import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from typing import Optional, Union, Tuple, List
 
-import dns.resolver
 import validators
-from email_validator import validate_email
+from email_validator import EmailNotValidError, validate_email
+
+_DKIM_RE = re.compile(
+    r"v=DKIM1;(\s*h=sha(1|256);)?(\s*k=rsa;)?(\s*t=[\w/]+;)?(\s*p=\S+)"
+)
+
+_DMARC_RE = re.compile(
+    r"^v=DMARC1;\s*((p=none|p=quarantine|p=reject|rua=mailto:[^;]+|ruf=mailto:[^;]+|pct=\d{1,3}|sp=none|sp=quarantine|sp=reject|aspf=r|aspf=s|adkim=r|adkim=s|fo=[01ds]|rf=afrf|rf=iodef|ri=\d+);?\s*)*\s*$",
+    re.IGNORECASE,
+)
+
+_DMARC_MAILTO_RE = re.compile(r"mailto:([^;]+)")
+
+_DMARC_PCT_RE = re.compile(r"pct=(\d{1,3})")
+
+_TXT_CACHE_MAX_SIZE = 1024
+# upper bound in seconds on how long an answer is cached, regardless of its TTL
+_TXT_CACHE_MAX_TTL = 300
+# seconds a failed lookup is cached for, long enough that a DNS outage isn't hammered by every mailer created, short
+# enough that a fixed record is picked up quickly
+_TXT_CACHE_NEGATIVE_TTL = 30
+# domain -> (expiry, records) for answers, or (expiry, exception) for failed lookups
+_TXT_CACHE = {}
+_TXT_CACHE_LOCK = threading.Lock()
+
+_SPF_INCLUDE_MAX_WORKERS = 8
+# the most include lookups made while checking one SPF record, RFC 7208 section 4.6.4 limits an SPF check to 10 DNS
+# lookups, which also stops include loops and overly deep include chains
+_SPF_LOOKUP_LIMIT = 10
+
+# seconds a TXT lookup may take in total, across retries and nameservers, before it fails
+_DNS_LIFETIME = 3.0
+# seconds to wait for any one nameserver before trying the next
+_DNS_TIMEOUT = 2.0
+_DNS_CACHE_SIZE = 1024
+# used when the system has no resolver configuration, i.e. some containers
+_FALLBACK_NAMESERVERS = ["1.1.1.1", "1.0.0.1", "8.8.8.8", "8.8.4.4"]
+# a loose local@domain.tld shape check for addresses that have already been validated upstream
+_EMAIL_FORMAT_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 
 
 def validate_user_email(
@@ -28,9 +69,44 @@ def validate_user_email(
         OR
         str: The original email address.
 
+    Raises:
+        EmailNotValidError: If the email address is not valid.
+
+    """
+    if check_deliverability:
+        normalized = validate_email(email, check_deliverability=True).normalized
+    else:
+        normalized = _validate_email_syntax(email)
+    return normalized if return_normalized else email
+
+
+@lru_cache(maxsize=4096)
+def _validate_email_syntax(email: str) -> str:
+    """
+    Validates an email address without any DNS lookups and returns it normalized. Results are cached, as the same
+    addresses are validated for every email sent to them, invalid addresses aren't cached and raise each time.
+    """
+    return validate_email(email, check_deliverability=False).normalized
+
+
+def validate_email_format(email: str) -> str:
+    """
+    Checks an email address has the basic local@domain.tld shape, without the full syntax rules or normalization of
+    `validate_user_email`. Meant for lists that have already been cleansed, where only obvious mistakes need catching.
+
+    Args:
+        email (str): The email address to check.
+
+    Returns:
+        str: The email address, unchanged.
+
+    Raises:
+        EmailNotValidError: If the email address doesn't look like an email address.
+
     """
-    email_info = validate_email(email, check_deliverability=check_deliverability)
-    return email_info.normalized if return_normalized else email
+    if not isinstance(email, str) or not _EMAIL_FORMAT_RE.match(email):
+        raise EmailNotValidError(f"The email address {email!r} is not valid.")
+    return email
 
 
 def validate_dkim_record(dkim_record: str) -> Union[Optional[bytes], bool]:
@@ -43,22 +119,21 @@ def validate_dkim_record(dkim_record: str) -> Union[Optional[bytes], bool]:
 
     """
 
-    dkim_regex = re.compile(
-        r"v=DKIM1;(\s*h=sha(1|256);)?(\s*k=rsa;)?(\s*t=[\w/]+;)?(\s*p=[A-Za-z0-9+/]+={0,2})"
-    )
-
     # Remove quotes and spaces from the record for validation
     dkim_record = dkim_record.replace('"', "").replace(" ", "").strip()
 
     # Matching the record with the regex
-    match = dkim_regex.fullmatch(dkim_record)
+    match = _DKIM_RE.fullmatch(dkim_record)
     if not match:
         return False
 
-    # Extract and decode the public key
+    # Extract and decode the public key, the base64 alphabet is validated by the decode rather than the regex
     public_key_encoded = match.group(5)[2:]  # Correctly remove 'p='
 
-    return True if base64.b64decode(public_key_encoded) else False
+    try:
+        return True if base64.b64decode(public_key_encoded, validate=True) else False
+    except binascii.Error:
+        return False
 
 
 def get_address_type(address):
@@ -71,25 +146,34 @@ def get_address_type(address):
     Returns:
     dict: A dictionary with the address type and the address.
     """
+    return {_get_address_type(address): address}
+
+
+@lru_cache(maxsize=32)
+def _get_address_type(address) -> str:
+    """
+    Gets the type of an address, "ipv4", "ipv6", "domain" or "invalid". Cached, as the same mail server address is
+    checked every time a mailer's setup is validated, a new dict is still returned by `get_address_type` each call.
+    """
     try:
         # Check for IPv4
         ipaddress.IPv4Address(address)
-        return {"ipv4": address}
+        return "ipv4"
     except ipaddress.AddressValueError:
         pass
 
     try:
         # Check for IPv6
         ipaddress.IPv6Address(address)
-        return {"ipv6": address}
+        return "ipv6"
     except ipaddress.AddressValueError:
         pass
 
     # If it's not an IP address, treat it as a domain
     if validators.domain(address):
-        return {"domain": address}
+        return "domain"
 
-    return {"invalid": address}
+    return "invalid"
 
 
 def resolve_domain(domain: str) -> Tuple[List[str], List[str]]:
@@ -118,6 +202,101 @@ def resolve_domain(domain: str) -> Tuple[List[str], List[str]]:
     return ipv4_addresses, ipv6_addresses
 
 
+@lru_cache(maxsize=1)
+def _get_resolver():
+    """
+    Gets the resolver shared by every lookup, so its connection setup and its TTL-honouring answer cache are reused
+    rather than rebuilt per query. The system's nameservers are used, falling back to public ones if the system has
+    no resolver configuration.
+
+    Returns:
+        dns.resolver.Resolver: The shared resolver.
+
+    """
+    import dns.resolver
+
+    try:
+        resolver = dns.resolver.Resolver()
+    except dns.resolver.NoResolverConfiguration:
+        resolver = dns.resolver.Resolver(configure=False)
+        resolver.nameservers = _FALLBACK_NAMESERVERS
+
+    resolver.cache = dns.resolver.LRUCache(_DNS_CACHE_SIZE)
+    resolver.lifetime = _DNS_LIFETIME
+    resolver.timeout = _DNS_TIMEOUT
+    return resolver
+
+
+def resolve_txt_records(domain: str) -> Tuple[str, ...]:
+    """
+    Resolves the TXT records of a domain. Answers are cached in memory until their DNS TTL (capped at five minutes)
+    expires, so repeated lookups of the same domain (i.e. common SPF includes) don't go back out to the network. Failed
+    lookups are cached for 30 seconds and raise again.
+
+    Args:
+        domain (str): The domain name to query.
+
+    Returns:
+        tuple: The TXT records of the domain, each record's character-strings joined into a single string.
+
+    Raises:
+        dns.exception.DNSException: If the lookup fails, or doesn't complete within three seconds.
+
+    """
+    import dns.exception
+
+    with _TXT_CACHE_LOCK:
+        cached = _TXT_CACHE.get(domain)
+    if cached and cached[0] > time.monotonic():
+        if isinstance(cached[1], Exception):
+            raise cached[1].with_traceback(None)
+        return cached[1]
+
+    # the lookup itself runs outside the lock, so concurrent lookups of different domains don't wait on each other
+    try:
+        answers = _get_resolver().resolve(domain, "TXT")
+    except dns.exception.DNSException as e:
+        _cache_txt_records(domain, e, _TXT_CACHE_NEGATIVE_TTL)
+        raise
+    records = tuple(b"".join(rdata.strings).decode() for rdata in answers)
+    _cache_txt_records(domain, records, min(answers.rrset.ttl, _TXT_CACHE_MAX_TTL))
+
+    return records
+
+
+def _cache_txt_records(
+    domain: str, result: Union[Tuple[str, ...], Exception], ttl: float
+):
+    """Caches the result of a TXT lookup for `ttl` seconds, dropping the oldest entry if the cache is full."""
+    with _TXT_CACHE_LOCK:
+        if domain not in _TXT_CACHE and len(_TXT_CACHE) >= _TXT_CACHE_MAX_SIZE:
+            # drop the oldest entry, dicts keep insertion order
+            _TXT_CACHE.pop(next(iter(_TXT_CACHE)))
+        _TXT_CACHE[domain] = (time.monotonic() + ttl, result)
+
+
+def clear_dns_cache():
+    """
+    Clears the cached TXT lookups and the shared resolver's answer cache, so the next lookups go out to the network,
+    i.e. after fixing a domain's DNS records.
+    """
+    with _TXT_CACHE_LOCK:
+        _TXT_CACHE.clear()
+    _get_resolver().cache.flush()
+
+
+@lru_cache(maxsize=4096)
+def _parse_ip(ip: str) -> Union[ipaddress.IPv4Address, ipaddress.IPv6Address]:
+    """Parses and caches an IP address, raises ValueError if it is invalid."""
+    return ipaddress.ip_address(ip)
+
+
+@lru_cache(maxsize=4096)
+def _parse_network(network: str) -> Union[ipaddress.IPv4Network, ipaddress.IPv6Network]:
+    """Parses and caches a network, host bits are allowed. Raises ValueError if it is invalid."""
+    return ipaddress.ip_interface(network).network
+
+
 def is_ip_in_network(ip: str, network: str) -> bool:
     """
     Check if an IP address is in a given network.
@@ -138,20 +317,49 @@ def is_ip_in_network(ip: str, network: str) -> bool:
         raise TypeError("Invalid input parameters")
 
     try:
-
-        ip_obj = ipaddress.ip_address(ip)
-        network_obj = ipaddress.ip_interface(network).network
-        return ip_obj in network_obj
+        # parsed addresses and networks are cached, the same SPF networks are checked on every send
+        return _parse_ip(ip) in _parse_network(network)
 
     except ValueError:
         raise ValueError("Invalid IP or network")
 
 
+class _SpfLookups:
+    """
+    The include lookups made while checking one SPF record, shared by every thread checking its includes. Each domain
+    is looked up at most once, and no more than `_SPF_LOOKUP_LIMIT` lookups are made in total.
+    """
+
+    __slots__ = ("visited", "remaining", "done", "_lock")
+
+    def __init__(self, limit: int = _SPF_LOOKUP_LIMIT):
+        self.visited = set()
+        self.remaining = limit
+        # set once the check has an answer, so workers still running don't start new lookups
+        self.done = False
+        self._lock = threading.Lock()
+
+    def take(self, included_domain: str) -> bool:
+        """
+        Claims a lookup of an included domain.
+
+        Returns:
+            bool: False if the domain was already looked up, the lookup budget is spent or the check is done.
+        """
+        with self._lock:
+            if self.done or self.remaining <= 0 or included_domain in self.visited:
+                return False
+            self.visited.add(included_domain)
+            self.remaining -= 1
+            return True
+
+
 def spf_check(
     spf_record: str,
     ipv4: Optional[Union[str, List[str]]] = None,
     ipv6: Optional[Union[str, List[str]]] = None,
     domain: Optional[str] = None,
+    lookups: Optional[_SpfLookups] = None,
 ):
     """
     Args:
@@ -161,6 +369,8 @@ def spf_check(
         ipv6: Optional parameter for the IPv6 addresses to be checked against the SPF record. It can be a single
             IPv6 address or a list of IPv6 addresses.
         domain: Optional parameter for the domain name to be checked against the SPF record.
+        lookups: The include lookups already made, when checking a record reached through an `include:`. Leave as
+            None for the top-level record.
 
     Returns:
         Returns True if the SPF record authorizes the provided IPv4 addresses, IPv6 addresses, or the domain.
@@ -209,40 +419,131 @@ def spf_check(
     if not parts or parts[0] != "v=spf1":
         raise ValueError("Invalid SPF record")
 
-    # Check each part of the SPF record
+    # Convert the addresses to lists if they're not already
+    ipv4_list = [ipv4] if isinstance(ipv4, str) else ipv4 or []
+    ipv6_list = [ipv6] if isinstance(ipv6, str) else ipv6 or []
+
+    # Check each part of the SPF record in a single pass, includes are collected and resolved together afterwards
+    includes = []
+    fail_all = False
     for part in parts[1:]:
-        if part.startswith("include:"):
-            included_domain = part.split(":")[1]
-            if domain == included_domain:
+        mechanism, sep, value = part.partition(":")
+        if not sep:
+            fail_all = fail_all or part == "-all"
+
+        elif mechanism == "include":
+            if domain == value:
                 return True
-            try:
-                answers = dns.resolver.resolve(included_domain, "TXT")
-                for rdata in answers:
-                    if spf_check(str(rdata), ipv4, ipv6, domain):
-                        return True
-            except Exception as e:
-                return False
+            includes.append(value)
 
-        elif part.startswith("ip4:"):
-            network = part.split(":")[1]
-            # Convert ipv4 to a list if it's not already
-            ipv4_list = [ipv4] if isinstance(ipv4, str) else ipv4
+        elif mechanism == "ip4":
             for ipv4_address in ipv4_list:
-                if ipv4_address and is_ip_in_network(ipv4_address, network):
+                if ipv4_address and is_ip_in_network(ipv4_address, value):
                     return True
 
-        elif part.startswith("ip6:"):
-            network = ":".join(part.split(":")[1:])
-            # Convert ipv6 to a list if it's not already
-            ipv6_list = [ipv6] if isinstance(ipv6, str) else ipv6
+        elif mechanism == "ip6":
             for ipv6_address in ipv6_list:
-                if ipv6_address and is_ip_in_network(ipv6_address, network):
+                if ipv6_address and is_ip_in_network(ipv6_address, value):
                     return True
 
+    if includes:
+        if lookups is None:
+            authorized = check_spf_includes(includes, ipv4, ipv6, domain)
+        else:
+            # nested includes are checked one after another, in the worker checking the top-level include
+            authorized = any(
+                check_spf_include(included_domain, ipv4, ipv6, domain, lookups)
+                for included_domain in includes
+            )
+        if authorized:
+            return True
+
     # Check the -all mechanism
-    if "-all" in parts:
+    if fail_all:
         return False  # The IP or domain is not authorized
 
+
+def check_spf_include(
+    included_domain: str,
+    ipv4: Optional[Union[str, List[str]]] = None,
+    ipv6: Optional[Union[str, List[str]]] = None,
+    domain: Optional[str] = None,
+    lookups: Optional[_SpfLookups] = None,
+) -> bool:
+    """
+    Checks whether any SPF record published by an `include:` domain authorizes the sender.
+
+    Args:
+        included_domain (str): The domain named by the `include:` mechanism.
+        ipv4: The IPv4 address(es) to check, see `spf_check`.
+        ipv6: The IPv6 address(es) to check, see `spf_check`.
+        domain: The domain name to check, see `spf_check`.
+        lookups: The include lookups already made while checking the same top-level record. Defaults to a new
+            budget of 10 lookups.
+
+    Returns:
+        bool: True if the included domain authorizes the sender. False otherwise, if the lookup fails, or if the
+            domain was already looked up or the lookup budget is spent.
+
+    """
+    if lookups is None:
+        lookups = _SpfLookups()
+    if not lookups.take(included_domain):
+        return False
+    try:
+        return any(
+            spf_check(record, ipv4, ipv6, domain, lookups)
+            for record in resolve_txt_records(included_domain)
+        )
+    except Exception:
+        return False
+
+
+def check_spf_includes(
+    includes: List[str],
+    ipv4: Optional[Union[str, List[str]]] = None,
+    ipv6: Optional[Union[str, List[str]]] = None,
+    domain: Optional[str] = None,
+) -> bool:
+    """
+    Resolves and checks all `include:` domains of an SPF record concurrently, as each one is a separate DNS round trip.
+    Returns as soon as any of them authorizes the sender. Only these top-level includes are checked concurrently,
+    includes nested under them are checked serially by the same worker, and all of them share one budget of 10
+    lookups (RFC 7208).
+
+    Args:
+        includes (List[str]): The domains named by the record's `include:` mechanisms.
+        ipv4: The IPv4 address(es) to check, see `spf_check`.
+        ipv6: The IPv6 address(es) to check, see `spf_check`.
+        domain: The domain name to check, see `spf_check`.
+
+    Returns:
+        bool: True if any of the included domains authorizes the sender.
+
+    """
+    lookups = _SpfLookups()
+    executor = ThreadPoolExecutor(
+        max_workers=min(len(includes), _SPF_INCLUDE_MAX_WORKERS)
+    )
+    futures = [
+        executor.submit(
+            check_spf_include, included_domain, ipv4, ipv6, domain, lookups
+        )
+        for included_domain in includes
+    ]
+    try:
+        for future in as_completed(futures):
+            if future.result():
+                return True
+        return False
+    finally:
+        # don't wait on the remaining lookups once we have an answer, and stop the running workers starting new ones
+        lookups.done = True
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
 def get_dmarc_record_match(record):
     """
     Clean up the record and checks if it's a match.
@@ -260,16 +561,11 @@ def get_dmarc_record_match(record):
     # Removing quotes and spaces from the record for validation
     clean_record = record.replace('"', "").strip()
 
-    mailto_addresses = re.findall(r"mailto:([^;]+)", clean_record)
+    mailto_addresses = _DMARC_MAILTO_RE.findall(clean_record)
     for address in mailto_addresses:
         validate_user_email(address)
 
-    # Regular expression to validate DMARC record
-    dmarc_regex = re.compile(
-        r"^v=DMARC1;\s*((p=none|p=quarantine|p=reject|rua=mailto:[^;]+|ruf=mailto:[^;]+|pct=\d{1,3}|sp=none|sp=quarantine|sp=reject|aspf=r|aspf=s|adkim=r|adkim=s|fo=[01ds]|rf=afrf|rf=iodef|ri=\d+);?\s*)*\s*$",
-        re.IGNORECASE,
-    )
-    return dmarc_regex.fullmatch(clean_record)
+    return _DMARC_RE.fullmatch(clean_record)
 
 
 def validate_dmarc_record(record):
@@ -291,7 +587,7 @@ def validate_dmarc_record(record):
 
     # Check pct value if exists
     if record_match:
-        pct_match = re.search(r"pct=(\d{1,3})", record)
+        pct_match = _DMARC_PCT_RE.search(record)
         if pct_match:
             pct_value = int(pct_match.group(1))
             if pct_value < 0 or pct_value > 100:
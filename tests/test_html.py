@@ -1,15 +1,27 @@
 import base64
 import hashlib
 import os
+import subprocess
+import sys
+import tempfile
 import unittest
 from email.mime.multipart import MIMEMultipart
+from io import BytesIO
 from unittest import mock
+
+from bs4 import BeautifulSoup
+from PIL import Image
+
 import smtpymailer.html_parse
+from smtpymailer.precompile import precompile_templates
 from smtpymailer.utils import find_project_root
 from smtpymailer.html_parse import (
     check_data_in_html_el,
     make_html_content,
-    convert_img_elements
+    convert_img_elements,
+    clear_remote_img_cache,
+    change_image_type,
+    load_img_data,
 )
 
 
@@ -77,8 +89,54 @@ class TestRenderHtmlTemplate(unittest.TestCase):
 
         self.assertNotEqual(expected_html, result)
 
+    def test_jinja_environment_cached(self):
+        template_path = os.path.join(find_project_root(), "tests/templates")
+
+        env = smtpymailer.html_parse.create_jinja_environment([template_path])
+
+        self.assertIs(env, smtpymailer.html_parse.create_jinja_environment(template_path))
+        self.assertIsNot(
+            env, smtpymailer.html_parse.create_jinja_environment([template_path, template_path])
+        )
+        self.assertFalse(env.auto_reload)
+
+    def test_jinja_imported_lazily(self):
+        code = "import sys, smtpymailer; print('jinja2' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "False")
+
+    def test_selectolax_imported_lazily(self):
+        code = "import sys, smtpymailer; print('selectolax' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "False")
+
+    def test_precompile_writes_bytecode_cache(self):
+        template_path = os.path.join(find_project_root(), "tests/templates")
+
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch.dict(
+            os.environ, {"SMTPYMAILER_BYTECODE_DIR": cache_dir}
+        ):
+            smtpymailer.html_parse._get_bytecode_cache.cache_clear()
+            smtpymailer.html_parse._get_jinja_environment.cache_clear()
+            try:
+                names = precompile_templates(template_path)
+                cached = os.listdir(cache_dir)
+            finally:
+                smtpymailer.html_parse._get_bytecode_cache.cache_clear()
+                smtpymailer.html_parse._get_jinja_environment.cache_clear()
+
+        self.assertEqual(sorted(names), ["test.html", "test_real_email.html"])
+        self.assertEqual(len(cached), 2)
+
 
 class TestAttachRemoteImagesAsCid(unittest.TestCase):
+    def setUp(self):
+        clear_remote_img_cache()
+
     def attach_images_as_cid_helper(
         self, images, html_content=None, fake_content=None, fake_content_match=None
     ):
@@ -87,10 +145,10 @@ class TestAttachRemoteImagesAsCid(unittest.TestCase):
         if not fake_content_match:
             fake_content_match = fake_content
 
-        with mock.patch("requests.get") as mock_get:
+        with mock.patch("requests.Session.get") as mock_get:
             # Set up the mock response
             mock_response = mock.Mock()
-            mock_response.content = fake_content
+            mock_response.iter_content.return_value = [fake_content]
             mock_response.raise_for_status = mock.Mock()
             mock_get.return_value = mock_response
 
@@ -104,17 +162,19 @@ class TestAttachRemoteImagesAsCid(unittest.TestCase):
             msg = MIMEMultipart()
             result = convert_img_elements(html_content, msg)
 
-            mock_get.assert_called_with("https://example.com/image.jpg", stream=True)
+            mock_get.assert_called_with(
+                "https://example.com/image.jpg", stream=True, timeout=(3, 10)
+            )
 
-            cid_hash = hashlib.md5(fake_content_match).hexdigest()
-            for i in range(images):
-                self.assertIn(f"cid:{cid_hash}{i}", result)
+            # every element shows the same image, so they all share the first element's CID
+            cid_hash = hashlib.blake2b(fake_content_match, digest_size=8).hexdigest()
+            self.assertEqual(result.count(f"cid:{cid_hash}0"), images)
 
-            # Check the number of attachments
-            self.assertEqual(len(msg.get_payload()), images)
+            # Check the number of attachments, the image is only attached once
+            self.assertEqual(len(msg.get_payload()), 1)
 
             # Inspect the attachments
-            image_numbers = [i for i in range(images)]
+            image_numbers = [0]
             imgno = 0
             for part in msg.walk():
                 if part.get_content_maintype() == "image":
@@ -163,11 +223,23 @@ class TestAttachRemoteImagesAsCid(unittest.TestCase):
         html_out = convert_img_elements(html_content, msg)
         self.assertEqual(html_content, html_out)
 
-    @mock.patch("requests.get")
+    def test_check_data_in_html_el_without_images(self):
+        self.assertEqual(
+            check_data_in_html_el("<html><body><p>no images</p></body></html>"),
+            {"base64": 0, "cid": 0, "data-smtpymailer": 0},
+        )
+
+    def test_alter_img_html_unchanged_returns_original(self):
+        msg = MIMEMultipart()
+        html_content = "<HTML><body><IMG src='does/not/exist.png' data-cid></body></HTML>"
+        html_out = convert_img_elements(html_content, msg)
+        self.assertIs(html_content, html_out)
+
+    @mock.patch("requests.Session.get")
     def test_alter_img_html_with_base_and_cid(self, mock):
         # Set up the mock response
         mock_response = mock.Mock()
-        mock_response.content = b"fake_img_data"
+        mock_response.iter_content.return_value = [b"fake_img_data"]
         mock_response.raise_for_status = mock.Mock()
         mock.return_value = mock_response
 
@@ -206,6 +278,20 @@ class TestAttachRemoteImagesAsCid(unittest.TestCase):
         )
         self.assertNotEqual(html_content, html_out)
 
+    def test_change_image_type_to_jpg(self):
+        with open("./tests/assets/1px.png", "rb") as file:
+            png_content = file.read()
+        img = BeautifulSoup('<img data-convert="jpg">', "html.parser").img
+
+        img_data, mime_type = change_image_type(img, "image/png", png_content)
+
+        self.assertEqual(mime_type, "image/jpeg")
+        self.assertEqual(Image.open(BytesIO(img_data)).format, "JPEG")
+
+    @mock.patch("smtpymailer.html_parse._get_simplejpeg", return_value=None)
+    def test_change_image_type_to_jpg_without_simplejpeg(self, _):
+        self.test_change_image_type_to_jpg()
+
     def test_convert_cid_image_same_type(self):
         html_content = '<html><body><img data-cid data-convert="jpg" data-format="RGB" src="https://example.com/image.jpg"></body></html>'
         self.attach_images_as_cid_helper(images=1, html_content=html_content)
@@ -232,8 +318,25 @@ class TestAttachRemoteImagesAsCid(unittest.TestCase):
         # Check the number of attachments
         self.assertEqual(len(msg.get_payload()), 0)
 
+    def test_no_data_attributes_not_parsed(self):
+        html_content = '<html><body><img src="https://example.com/image.jpg"></body></html>'
+        msg = MIMEMultipart()
+        with mock.patch("bs4.BeautifulSoup") as mock_soup:
+            result = convert_img_elements(html_content, msg)
+
+        self.assertIs(result, html_content)
+        mock_soup.assert_not_called()
+        self.assertEqual(len(msg.get_payload()), 0)
+
+    def test_uppercase_data_attribute_converted(self):
+        html_content = '<html><body><IMG DATA-CID src="https://example.com/image.jpg"></body></html>'
+        self.attach_images_as_cid_helper(images=1, html_content=html_content)
+
 
 class TestConvertRemoteImgElementsToBase64(unittest.TestCase):
+    def setUp(self):
+        clear_remote_img_cache()
+
     def convert_images_to_base64_helper(self, images):
         """
         Converts images in HTML content to base64 format.
@@ -242,10 +345,10 @@ class TestConvertRemoteImgElementsToBase64(unittest.TestCase):
             images (int): The number of images to convert to base64.
 
         """
-        with mock.patch("requests.get") as mock_get:
+        with mock.patch("requests.Session.get") as mock_get:
             # Set up the mock response
             mock_response = mock.Mock()
-            mock_response.content = b"fake image content"
+            mock_response.iter_content.return_value = [b"fake image content"]
             mock_response.raise_for_status = mock.Mock()
             mock_get.return_value = mock_response
 
@@ -261,7 +364,9 @@ class TestConvertRemoteImgElementsToBase64(unittest.TestCase):
             self.assertEqual(converted_data["base64"], images)
             self.assertEqual(converted_data["cid"], 0)
             self.assertEqual(converted_data["data-smtpymailer"], images)
-            self.assertEqual(mock_get.call_count, images)
+            self.assertIn('src="data:image/jpeg;base64,', result)
+            # the same src is only downloaded once
+            self.assertEqual(mock_get.call_count, 1)
 
     def test_convert_single_image_to_base64(self):
         self.convert_images_to_base64_helper(images=1)
@@ -269,6 +374,62 @@ class TestConvertRemoteImgElementsToBase64(unittest.TestCase):
     def test_convert_ten_images_to_base64(self):
         self.convert_images_to_base64_helper(images=10)
 
+    def convert_image_content_type_helper(self, src, content):
+        with mock.patch("requests.Session.get") as mock_get:
+            mock_response = mock.Mock()
+            mock_response.iter_content.return_value = [content]
+            mock_response.raise_for_status = mock.Mock()
+            mock_get.return_value = mock_response
+
+            html_content = f'<html><body><img data-base src="{src}"></body></html>'
+            return convert_img_elements(html_content, MIMEMultipart())
+
+    def test_content_type_ignores_query_string(self):
+        result = self.convert_image_content_type_helper(
+            "https://example.com/image.gif?v=2", b"fake image content"
+        )
+        self.assertIn('src="data:image/gif;base64,', result)
+
+    def test_content_type_sniffed_from_image_data(self):
+        with open("./tests/assets/dog.jpg", "rb") as file:
+            jpg_content = file.read()
+        result = self.convert_image_content_type_helper(
+            "https://example.com/image?id=1", jpg_content
+        )
+        self.assertIn('src="data:image/jpeg;base64,', result)
+
+    def test_content_type_defaults_to_png(self):
+        result = self.convert_image_content_type_helper(
+            "https://example.com/image?id=1", b"fake image content"
+        )
+        self.assertIn('src="data:image/png;base64,', result)
+
+    def test_remote_image_cached_between_calls(self):
+        with mock.patch("requests.Session.get") as mock_get:
+            mock_response = mock.Mock()
+            mock_response.iter_content.return_value = [b"fake image content"]
+            mock_response.raise_for_status = mock.Mock()
+            mock_get.return_value = mock_response
+
+            html_content = '<html><body><img data-base src="https://example.com/image.jpg"></body></html>'
+            first = convert_img_elements(html_content, MIMEMultipart())
+            second = convert_img_elements(html_content, MIMEMultipart())
+
+            self.assertEqual(first, second)
+            self.assertEqual(mock_get.call_count, 1)
+
+    def test_remote_image_over_size_limit_is_skipped(self):
+        with mock.patch("requests.Session.get") as mock_get:
+            mock_response = mock.Mock()
+            mock_response.iter_content.return_value = [b"x" * 1024] * 4
+            mock_response.raise_for_status = mock.Mock()
+            mock_get.return_value = mock_response
+
+            self.assertIsNone(
+                load_img_data("https://example.com/image.jpg", max_image_bytes=2048)
+            )
+            mock_response.close.assert_called_once()
+
     def test_attach_unavailable_url_base64(self):
         html_content = (
             '<html><body><img data-base src="https://example.com/image.jpg"></body></html>'
@@ -333,15 +494,15 @@ class TestAttachLocalImagesAsCid(unittest.TestCase):
         msg = MIMEMultipart()
         result = convert_img_elements(html_content, msg)
 
-        cid_hash = hashlib.md5(fake_content_match).hexdigest()
-        for i in range(images):
-            self.assertIn(f"cid:{cid_hash}{i}", result)
+        # every element shows the same image, so they all share the first element's CID
+        cid_hash = hashlib.blake2b(fake_content_match, digest_size=8).hexdigest()
+        self.assertEqual(result.count(f"cid:{cid_hash}0"), images)
 
-        # Check the number of attachments
-        self.assertEqual(len(msg.get_payload()), images)
+        # Check the number of attachments, the image is only attached once
+        self.assertEqual(len(msg.get_payload()), 1)
 
         # Inspect the attachments
-        image_numbers = [i for i in range(images)]
+        image_numbers = [0]
         imgno = 0
         for part in msg.walk():
             if part.get_content_maintype() == "image":
@@ -361,5 +522,16 @@ class TestAttachLocalImagesAsCid(unittest.TestCase):
     def test_attach_lots_of_images_as_cid(self):
         self.attach_images_as_cid_helper(images=10)
 
+    def test_attach_distinct_images_as_cid(self):
+        html_content = (
+            '<html><body><img data-cid src="./tests/assets/dog.jpg">'
+            '<img data-cid src="./tests/assets/1px.jpg">'
+            '<img data-cid src="./tests/assets/dog.jpg"></body></html>'
+        )
+        msg = MIMEMultipart()
+        convert_img_elements(html_content, msg)
+
+        self.assertEqual(len(msg.get_payload()), 2)
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,16 +1,28 @@
+import asyncio
 import os
+import pathlib
 import random
+import smtplib
 import string
+import tempfile
+import threading
+import traceback
 import unittest
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
 from time import sleep
 from typing import Optional
+from unittest import mock
 
 from dotenv import load_dotenv
 from email_validator import EmailNotValidError
 from mailinator import Mailinator, GetInboxRequest, GetMessageRequest
 
-from smtpymailer.mailer import Contact, validate_send_email, SmtpMailer
+import smtpymailer.mailer
+import smtpymailer.validation
+from smtpymailer.mailer import BulkSendAborted, Contact, validate_send_email, SmtpMailer
 from smtpymailer.utils import find_project_root
+from tests.test_validation import make_txt_answer
 
 
 class TestContact(unittest.TestCase):
@@ -41,6 +53,620 @@ class TestContact(unittest.TestCase):
         contact = Contact("johndoe@example.com", "John Doe", False)
         self.assertEqual(contact.get_domain(), "example.com")
 
+    def test_slots(self):
+        """Test contacts don't carry a per-instance __dict__."""
+        contact = Contact("johndoe@example.com", "John Doe", False)
+        self.assertFalse(hasattr(contact, "__dict__"))
+        with self.assertRaises(AttributeError):
+            contact.phone = "0123"
+
+
+class TestSerializeMessage(unittest.TestCase):
+    def test_serialized_with_crlf_line_endings(self):
+        """Test the message is serialized to bytes that sendmail can send as is."""
+        mailer = SmtpMailer.__new__(SmtpMailer)
+        mailer.message = MIMEMultipart("mixed")
+        mailer.message["Subject"] = "Test"
+        mailer.message.attach(MIMEText("line one\nline two", "plain"))
+
+        raw = mailer._serialize_message()
+
+        self.assertIsInstance(raw, bytes)
+        self.assertEqual(raw.count(b"\n"), raw.count(b"\r\n"))
+        self.assertEqual(
+            raw, mailer.message.as_string().replace("\n", "\r\n").encode("ascii")
+        )
+
+
+class TestPersistentConnection(unittest.TestCase):
+    def setUp(self):
+        self.servers = []
+
+        def connect():
+            server = mock.MagicMock()
+            server.sendmail.return_value = {}
+            self.servers.append(server)
+            return server
+
+        self.mailer = SmtpMailer.__new__(SmtpMailer)
+        self.mailer.sender = Contact("johndoe@example.com", "John Doe", False)
+        self.mailer.message = MIMEMultipart("mixed")
+        self.mailer._build_lock = threading.Lock()
+        self.mailer._connect_to_server = connect
+
+    def test_connection_reused_between_sends(self):
+        with self.mailer as mailer:
+            self.assertTrue(mailer._send_message(["foo@example.com"]))
+            self.assertTrue(mailer._send_message(["bar@example.com"]))
+
+        self.assertEqual(len(self.servers), 1)
+        self.assertEqual(self.servers[0].sendmail.call_count, 2)
+        self.servers[0].quit.assert_called_once()
+
+    def test_connections_closed_when_mailer_collected(self):
+        self.mailer._send_message(["foo@example.com"])
+        self.mailer._get_executor()
+        executor = self.mailer._executor
+        del self.mailer
+
+        self.servers[0].quit.assert_called_once()
+        self.assertTrue(executor._shutdown)
+
+    def test_send_after_close_reconnects(self):
+        self.mailer._send_message(["foo@example.com"])
+        self.mailer.close()
+        self.mailer._send_message(["foo@example.com"])
+        self.mailer.close()
+
+        self.assertEqual(len(self.servers), 2)
+
+    def test_pool_uses_connection_limits(self):
+        self.mailer.max_connections = 2
+        self.mailer.max_messages_per_connection = 3
+        pool = self.mailer._get_pool()
+        self.mailer.close()
+
+        self.assertEqual(pool.size, 2)
+        self.assertEqual(pool.max_messages_per_connection, 3)
+
+    def test_send_many_recycles_connections(self):
+        self.mailer.max_connections = 1
+        self.mailer.max_messages_per_connection = 2
+        messages = [
+            {"recipients": "foo@example.com", "subject": "Test", "html_content": "<p>Hi</p>"}
+        ] * 5
+
+        with self.mailer as mailer:
+            self.assertEqual(mailer.send_many(messages), [True] * 5)
+
+        self.assertEqual([server.sendmail.call_count for server in self.servers], [2, 2, 1])
+
+    def test_send_many_aborts_when_too_many_fail(self):
+        self.mailer.max_connections = 1
+        messages = [
+            {"recipients": "foo@example.com", "subject": "Test", "html_content": "<p>Hi</p>"}
+        ] * 60
+        send = self.mailer._connect_to_server
+
+        def connect():
+            server = send()
+            server.sendmail.side_effect = smtplib.SMTPDataError(554, b"Rate limited")
+            return server
+
+        self.mailer._connect_to_server = connect
+        with self.assertRaises(BulkSendAborted) as context:
+            self.mailer.send_many(messages)
+
+        results = context.exception.results
+        self.assertEqual(len(results), 60)
+        self.assertIsNone(results[-1])
+        self.assertGreaterEqual(sum(result is not None for result in results), 30)
+        self.assertIsNone(self.mailer._pool)
+
+    def test_send_many_failures_below_threshold(self):
+        self.mailer.max_connections = 1
+        messages = [
+            {"recipients": "foo@example.com", "subject": "Test", "html_content": "<p>Hi</p>"},
+            {"recipients": "foo@example.com", "subject": "", "html_content": "<p>Hi</p>"},
+        ] * 30
+        send = self.mailer._connect_to_server
+        calls = iter(range(1000))
+
+        def connect():
+            def sendmail(*args):
+                if next(calls) % 4 == 0:
+                    raise smtplib.SMTPDataError(554, b"Refused")
+                return {}
+
+            server = send()
+            server.sendmail.side_effect = sendmail
+            return server
+
+        self.mailer._connect_to_server = connect
+        with self.mailer as mailer:
+            results = mailer.send_many(messages)
+
+        # the invalid emails aren't counted towards aborting, only the 1 in 4 refused by the server
+        self.assertEqual(sum(result is True for result in results), 22)
+        self.assertIsInstance(results[1], Exception)
+
+    def test_send_email_bulk_serializes_once(self):
+        batches = [["foo@example.com", "bar@example.com"], "baz@example.com"]
+
+        with mock.patch.object(
+            SmtpMailer, "_serialize_message", autospec=True, return_value=b"message"
+        ) as mock_serialize, self.mailer as mailer:
+            results = mailer.send_email_bulk(
+                batches, subject="Test", html_content="<p>Hi</p>"
+            )
+
+        self.assertEqual(results, [True, True])
+        mock_serialize.assert_called_once()
+        self.assertEqual(self.mailer.message["To"], "undisclosed-recipients:;")
+        sent = sorted(
+            call.args for server in self.servers for call in server.sendmail.call_args_list
+        )
+        self.assertEqual(
+            sent,
+            [
+                ("John Doe <johndoe@example.com>", ["baz@example.com"], b"message"),
+                (
+                    "John Doe <johndoe@example.com>",
+                    ["foo@example.com", "bar@example.com"],
+                    b"message",
+                ),
+            ],
+        )
+
+    def test_send_email_async(self):
+        self.mailer.max_connections = 2
+
+        async def send_all():
+            async with self.mailer as mailer:
+                return await asyncio.gather(
+                    *(
+                        mailer.send_email_async(
+                            f"foo{idx}@example.com",
+                            subject=f"Test {idx}",
+                            html_content="<p>Hi</p>",
+                        )
+                        for idx in range(6)
+                    )
+                )
+
+        self.assertEqual(asyncio.run(send_all()), [True] * 6)
+        self.assertLessEqual(len(self.servers), 2)
+        sent = [
+            call.args for server in self.servers for call in server.sendmail.call_args_list
+        ]
+        self.assertEqual(
+            sorted(recipients[0] for _, recipients, _ in sent),
+            sorted(f"foo{idx}@example.com" for idx in range(6)),
+        )
+        for _, recipients, msg in sent:
+            idx = recipients[0][3]
+            self.assertIn(f"Subject: Test {idx}".encode(), msg)
+
+    def test_send_email_async_error_raised(self):
+        async def send():
+            return await self.mailer.send_email_async(
+                "foo@example.com", subject="", html_content="<p>Hi</p>"
+            )
+
+        with self.assertRaises(Exception):
+            asyncio.run(send())
+        self.mailer.close()
+
+    def test_send_without_validating_recipients(self):
+        self.mailer.validate_recipients = False
+        with mock.patch("smtpymailer.utils.validate_user_email") as mock_validate:
+            self.assertTrue(
+                self.mailer.send_email(
+                    "foo@example.com", subject="Test", html_content="<p>Hi</p>"
+                )
+            )
+        mock_validate.assert_not_called()
+
+    def test_sync_sends_build_under_lock(self):
+        build_message = self.mailer._build_message
+        serialize_message = self.mailer._serialize_message
+        held = []
+
+        def build(*args, **kwargs):
+            held.append(self.mailer._build_lock.locked())
+            return build_message(*args, **kwargs)
+
+        def serialize():
+            held.append(self.mailer._build_lock.locked())
+            return serialize_message()
+
+        self.mailer._build_message = build
+        self.mailer._serialize_message = serialize
+        with self.mailer as mailer:
+            mailer.send_email("foo@example.com", subject="Test", html_content="<p>Hi</p>")
+            mailer.send_many(
+                [{"recipients": "bar@example.com", "subject": "Test", "html_content": "<p>Hi</p>"}]
+            )
+            mailer.send_email_bulk(
+                [["baz@example.com"]], subject="Test", html_content="<p>Hi</p>"
+            )
+        self.assertEqual(held, [True] * 6)
+
+    def test_send_email_bulk_no_batches(self):
+        with self.assertRaises(ValueError):
+            self.mailer.send_email_bulk([], subject="Test", html_content="<p>Hi</p>")
+
+    def test_send_error_raised(self):
+        def connect():
+            raise ValueError("Invalid server connection details")
+
+        self.mailer._connect_to_server = connect
+        with self.assertRaises(Exception):
+            self.mailer._send_message(["foo@example.com"])
+
+
+class TestQueryDnsRecords(unittest.TestCase):
+    def setUp(self):
+        smtpymailer.validation._TXT_CACHE.clear()
+        self.mailer = SmtpMailer.__new__(SmtpMailer)
+        self.mailer.mail_dkim_selector = "mail"
+
+    def tearDown(self):
+        smtpymailer.validation._TXT_CACHE.clear()
+
+    @mock.patch("dns.resolver.Resolver.resolve")
+    def test_records_queried_and_cached(self, mock_resolve):
+        answers = {
+            "_dmarc.example.com": make_txt_answer(["v=DMARC1; p=none"]),
+            "example.com": make_txt_answer(
+                [
+                    "google-site-verification=abc",
+                    "spf-verification=abc",
+                    "v=spf1 ip4:192.0.2.0/24 -all",
+                ]
+            ),
+            "mail._domainkey.example.com": make_txt_answer(["v=DKIM1; k=rsa; p=abc"]),
+        }
+        mock_resolve.side_effect = lambda name, rtype, **kwargs: answers[name]
+
+        expected = (
+            ["v=DMARC1; p=none"],
+            ["v=spf1 ip4:192.0.2.0/24 -all"],
+            ["v=DKIM1; k=rsa; p=abc"],
+        )
+        self.assertEqual(self.mailer._query_dns_records("example.com"), expected)
+        self.assertEqual(self.mailer._query_dns_records("example.com"), expected)
+        self.assertEqual(mock_resolve.call_count, 3)
+
+    @mock.patch("dns.resolver.Resolver.resolve")
+    def test_lookup_errors_raised(self, mock_resolve):
+        mock_resolve.side_effect = Exception("NXDOMAIN")
+
+        with self.assertRaises(Exception):
+            self.mailer._query_dns_records("example.com")
+
+
+class TestValidateAuthSetup(unittest.TestCase):
+    def setUp(self):
+        smtpymailer.mailer._AUTH_CACHE.clear()
+        self.mailer = SmtpMailer.__new__(SmtpMailer)
+        self.mailer.sender = Contact("johndoe@example.com", "John Doe", False)
+        self.mailer.mail_dkim_selector = "mail"
+        self.mailer.mail_server = "mail.example.com"
+        self.mailer._query_dns_records = mock.Mock(return_value=([], [], []))
+        self.mailer._validate_records = mock.Mock()
+
+    def tearDown(self):
+        smtpymailer.mailer._AUTH_CACHE.clear()
+
+    def test_validated_setup_cached(self):
+        self.mailer._validate_auth_setup()
+        self.mailer._validate_auth_setup()
+
+        self.mailer._query_dns_records.assert_called_once_with("example.com")
+
+    def test_revalidate_dns_bypasses_cache(self):
+        self.mailer._validate_auth_setup()
+        self.mailer._validate_auth_setup(revalidate_dns=True)
+
+        self.assertEqual(self.mailer._query_dns_records.call_count, 2)
+
+    def test_failed_setup_not_cached(self):
+        self.mailer._validate_records.side_effect = Exception("No valid SPF record")
+
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                self.mailer._validate_auth_setup()
+
+        self.assertEqual(self.mailer._query_dns_records.call_count, 2)
+
+    def test_expired_setup_revalidated(self):
+        self.mailer._validate_auth_setup()
+        key = ("example.com", "mail", "mail.example.com")
+        smtpymailer.mailer._AUTH_CACHE[key] -= smtpymailer.mailer._AUTH_CACHE_TTL
+
+        self.mailer._validate_auth_setup()
+
+        self.assertEqual(self.mailer._query_dns_records.call_count, 2)
+
+    def test_clear_dns_cache(self):
+        self.mailer._validate_auth_setup()
+        SmtpMailer.clear_dns_cache()
+        self.mailer._validate_auth_setup()
+
+        self.assertEqual(self.mailer._query_dns_records.call_count, 2)
+
+
+class TestValidateDnsModes(unittest.TestCase):
+    def make_mailer(self, validate_dns, side_effect=None):
+        with mock.patch.object(
+            SmtpMailer, "_setup_email_server_auth"
+        ), mock.patch.object(
+            SmtpMailer, "_validate_auth_setup", side_effect=side_effect
+        ) as mock_validate:
+            mailer = SmtpMailer(
+                "johndoe@example.com", "John Doe", validate_dns=validate_dns
+            )
+            if mailer._dns_validated is not None:
+                mailer._dns_validated.wait()
+        return mailer, mock_validate
+
+    def test_sync(self):
+        mailer, mock_validate = self.make_mailer("sync")
+        mock_validate.assert_called_once_with(revalidate_dns=False)
+        mailer._wait_for_auth_validation()
+
+    def test_skip(self):
+        mailer, mock_validate = self.make_mailer("skip")
+        mock_validate.assert_not_called()
+        mailer._wait_for_auth_validation()
+
+    def test_async(self):
+        mailer, mock_validate = self.make_mailer("async")
+        mock_validate.assert_called_once_with(revalidate_dns=False)
+        mailer._wait_for_auth_validation()
+
+    def test_async_failure_raised_on_send(self):
+        mailer, _ = self.make_mailer(
+            "async", side_effect=Exception("No valid SPF record found")
+        )
+        with self.assertRaises(Exception) as context:
+            mailer._wait_for_auth_validation()
+        self.assertIn("SPF", str(context.exception))
+
+    def test_async_failure_traceback_not_grown(self):
+        mailer, _ = self.make_mailer(
+            "async", side_effect=Exception("No valid SPF record found")
+        )
+        depths = []
+        for _ in range(3):
+            try:
+                mailer._wait_for_auth_validation()
+            except Exception as e:
+                depths.append(len(traceback.extract_tb(e.__traceback__)))
+        self.assertEqual(depths, [depths[0]] * 3)
+
+    def test_default_sync(self):
+        _, mock_validate = self.make_mailer(None)
+        mock_validate.assert_called_once_with(revalidate_dns=False)
+
+    def test_skip_from_config(self):
+        with mock.patch.object(SmtpMailer, "mail_skip_dns_validation", True):
+            _, mock_validate = self.make_mailer(None)
+            _, mock_validate_sync = self.make_mailer("sync")
+        mock_validate.assert_not_called()
+        mock_validate_sync.assert_called_once()
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            SmtpMailer("johndoe@example.com", "John Doe", validate_dns="later")
+
+
+class TestAddAttachments(unittest.TestCase):
+    def setUp(self):
+        self.mailer = SmtpMailer.__new__(SmtpMailer)
+        self.mailer.message = MIMEMultipart("mixed")
+
+    def test_attachment_added_with_filename(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "report.pdf")
+            with open(path, "wb") as f:
+                f.write(b"%PDF-1.4")
+            self.mailer._add_attachments(path)
+
+        part = self.mailer.message.get_payload()[0]
+        self.assertIn(
+            "attachment; filename=report.pdf", part.get_all("Content-Disposition")
+        )
+
+    def test_directory_not_attached(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(FileNotFoundError):
+                self.mailer._add_attachments(tmp_dir)
+            with self.assertRaises(FileNotFoundError):
+                self.mailer._add_attachments(os.path.join(tmp_dir, "missing.pdf"))
+
+
+class TestConstructBaseMessage(unittest.TestCase):
+    @mock.patch("socket.getfqdn", return_value="host.example.com")
+    def test_msgid_domain_looked_up_once(self, mock_getfqdn):
+        smtpymailer.mailer._get_msgid_domain.cache_clear()
+        mailer = SmtpMailer.__new__(SmtpMailer)
+        mailer.sender = Contact("johndoe@example.com", "John Doe", False)
+
+        first = mailer._construct_base_message("Subject", "foo@example.com")
+        second = mailer._construct_base_message("Subject", "foo@example.com")
+        smtpymailer.mailer._get_msgid_domain.cache_clear()
+
+        self.assertTrue(first["Message-Id"].endswith("@host.example.com>"))
+        self.assertNotEqual(first["Message-Id"], second["Message-Id"])
+        mock_getfqdn.assert_called_once()
+
+    @mock.patch("smtpymailer.mailer.validate_user_email")
+    def test_reply_to_checked_once(self, mock_validate):
+        mailer = SmtpMailer.__new__(SmtpMailer)
+        mailer.sender = Contact("johndoe@example.com", "John Doe", False)
+
+        for _ in range(3):
+            message = mailer._construct_base_message(
+                "Subject", "foo@example.com", reply_to="reply@example.com"
+            )
+
+        self.assertEqual(message["Reply-To"], "reply@example.com")
+        mock_validate.assert_called_once_with(
+            email="reply@example.com", check_deliverability=True
+        )
+
+
+class TestSetupEmailServerAuth(unittest.TestCase):
+    @mock.patch.object(SmtpMailer, "_connect_to_server")
+    def test_config_from_kwargs_and_environment(self, mock_connect):
+        mailer = SmtpMailer.__new__(SmtpMailer)
+        with mock.patch.dict(
+            os.environ,
+            {"MAIL_DKIM_SELECTOR": "selector", "MAIL_SKIP_DNS_VALIDATION": "true"},
+        ):
+            mailer._setup_email_server_auth(
+                mail_server="mail.example.com",
+                Mail_Port="587",
+                MAIL_USE_TLS=False,
+                MAIL_USERNAME="user",
+                mail_password="password",
+            )
+
+        self.assertEqual(mailer.mail_server, "mail.example.com")
+        self.assertEqual(mailer.mail_port, 587)
+        self.assertFalse(mailer.mail_use_tls)
+        self.assertEqual(mailer.mail_username, "user")
+        self.assertEqual(mailer.mail_password, "password")
+        self.assertEqual(mailer.mail_dkim_selector, "selector")
+        self.assertTrue(mailer.mail_skip_dns_validation)
+        mock_connect.assert_called_once()
+
+    @mock.patch.object(SmtpMailer, "_connect_to_server")
+    def test_probe_connection_used_by_first_send(self, mock_connect):
+        server = mock_connect.return_value
+        server.sendmail.return_value = {}
+        mailer = SmtpMailer.__new__(SmtpMailer)
+        mailer.sender = Contact("johndoe@example.com", "John Doe", False)
+        mailer.message = MIMEMultipart("mixed")
+        mailer._setup_email_server_auth(
+            MAIL_SERVER="mail.example.com",
+            MAIL_PORT="587",
+            MAIL_USE_TLS="True",
+            MAIL_USERNAME="user",
+            MAIL_PASSWORD="password",
+            MAIL_DKIM_SELECTOR="mail",
+        )
+        with mailer:
+            mailer._send_message(["foo@example.com"])
+
+        mock_connect.assert_called_once()
+        server.sendmail.assert_called_once()
+        server.quit.assert_called_once()
+
+    @mock.patch("smtpymailer.mailer.load_dotenv")
+    def test_dotenv_loaded_once(self, mock_load_dotenv):
+        smtpymailer.mailer._load_dotenv.cache_clear()
+        for _ in range(3):
+            mailer = SmtpMailer.__new__(SmtpMailer)
+            mailer._setup_email_server_auth(
+                verify_credentials=False,
+                MAIL_SERVER="mail.example.com",
+                MAIL_PORT="587",
+                MAIL_USE_TLS="True",
+                MAIL_USERNAME="user",
+                MAIL_PASSWORD="password",
+                MAIL_DKIM_SELECTOR="mail",
+            )
+        smtpymailer.mailer._load_dotenv.cache_clear()
+
+        mock_load_dotenv.assert_called_once()
+
+    @mock.patch.object(SmtpMailer, "_connect_to_server")
+    def test_probe_connection_closed_when_unused_mailer_collected(self, mock_connect):
+        server = mock_connect.return_value
+        mailer = SmtpMailer.__new__(SmtpMailer)
+        mailer._setup_email_server_auth(
+            MAIL_SERVER="mail.example.com",
+            MAIL_PORT="587",
+            MAIL_USE_TLS="True",
+            MAIL_USERNAME="user",
+            MAIL_PASSWORD="password",
+            MAIL_DKIM_SELECTOR="mail",
+        )
+        server.quit.assert_not_called()
+
+        del mailer
+
+        server.quit.assert_called_once()
+        server.sendmail.assert_not_called()
+
+    @mock.patch.object(SmtpMailer, "_connect_to_server")
+    def test_skip_verify_credentials(self, mock_connect):
+        mailer = SmtpMailer.__new__(SmtpMailer)
+        mailer._setup_email_server_auth(
+            verify_credentials=False,
+            MAIL_SERVER="mail.example.com",
+            MAIL_PORT="587",
+            MAIL_USE_TLS="True",
+            MAIL_USERNAME="user",
+            MAIL_PASSWORD="password",
+            MAIL_DKIM_SELECTOR="mail",
+        )
+
+        mock_connect.assert_not_called()
+
+
+class TestConnectToServer(unittest.TestCase):
+    def setUp(self):
+        self.mailer = SmtpMailer.__new__(SmtpMailer)
+        self.mailer.mail_server = "mail.example.com"
+        self.mailer.mail_port = 587
+        self.mailer.mail_use_tls = True
+        self.mailer.mail_username = "user"
+        self.mailer.mail_password = "password"
+
+    @mock.patch("smtpymailer.mailer.PipeliningSMTP_SSL")
+    @mock.patch("smtpymailer.mailer.PipeliningSMTP")
+    def test_starttls(self, mock_smtp, mock_smtp_ssl):
+        server = self.mailer._connect_to_server()
+
+        self.assertIs(server, mock_smtp.return_value)
+        server.starttls.assert_called_once()
+        server.login.assert_called_once_with("user", "password")
+        mock_smtp_ssl.assert_not_called()
+
+    @mock.patch("smtpymailer.mailer.PipeliningSMTP_SSL")
+    @mock.patch("smtpymailer.mailer.PipeliningSMTP")
+    def test_implicit_tls(self, mock_smtp, mock_smtp_ssl):
+        self.mailer.mail_port = 465
+        self.mailer.mail_use_ssl = True
+
+        server = self.mailer._connect_to_server()
+
+        self.assertIs(server, mock_smtp_ssl.return_value)
+        mock_smtp_ssl.assert_called_once_with(
+            "mail.example.com", 465, context=smtpymailer.mailer._get_ssl_context()
+        )
+        server.starttls.assert_not_called()
+        server.login.assert_called_once_with("user", "password")
+        mock_smtp.assert_not_called()
+
+    @mock.patch.object(SmtpMailer, "_connect_to_server")
+    def test_port_465_uses_implicit_tls(self, mock_connect):
+        mailer = SmtpMailer.__new__(SmtpMailer)
+        mailer._setup_email_server_auth(
+            MAIL_SERVER="mail.example.com",
+            MAIL_PORT="465",
+            MAIL_USE_TLS="False",
+            MAIL_USERNAME="user",
+            MAIL_PASSWORD="password",
+            MAIL_DKIM_SELECTOR="mail",
+        )
+
+        self.assertTrue(mailer.mail_use_ssl)
+
 
 class TestValidateSendEmail(unittest.TestCase):
     recipient_domain = "team829298.testinator.com"
@@ -99,6 +725,61 @@ class TestValidateSendEmail(unittest.TestCase):
                 None, "template.txt", None, "Subject", ["recipient@mail.com"]
             )
 
+    def test_content_and_template_not_found(self):
+        # html_content is used over the template, so the template isn't looked up
+        validate_send_email(
+            "HTML content", "template.txt", None, "Subject", ["recipient@mail.com"]
+        )
+
+    def test_invalid_attachment(self):
+        with self.assertRaises(FileNotFoundError):
+            validate_send_email(
+                "HTML content",
+                None,
+                None,
+                "Subject",
+                ["recipient@mail.com"],
+                ["./tests/assets/dog.pdf", "./tests/assets/invalid.pdf"],
+            )
+
+    def test_invalid_attachments_reported_together(self):
+        with self.assertRaises(FileNotFoundError) as context:
+            validate_send_email(
+                "HTML content",
+                None,
+                None,
+                "Subject",
+                ["recipient@mail.com"],
+                ["./missing_one.pdf", "./tests/assets/dog.pdf", "./missing_two.pdf"],
+            )
+
+        self.assertIn("./missing_one.pdf", str(context.exception))
+        self.assertIn("./missing_two.pdf", str(context.exception))
+        self.assertNotIn("dog.pdf", str(context.exception))
+
+    def test_invalid_path_attachment(self):
+        with self.assertRaises(FileNotFoundError) as context:
+            validate_send_email(
+                "HTML content",
+                None,
+                None,
+                "Subject",
+                ["recipient@mail.com"],
+                [pathlib.Path("missing.pdf"), "./tests/assets/dog.pdf"],
+            )
+
+        self.assertIn("missing.pdf", str(context.exception))
+
+    def test_valid_attachments(self):
+        validate_send_email(
+            "HTML content",
+            None,
+            None,
+            "Subject",
+            ["recipient@mail.com"],
+            self.attachments,
+        )
+
     def test_valid(self):
         # Assuming all the inputs are valid, the test will pass if no Exceptions are raised
         validate_send_email(
@@ -120,6 +801,24 @@ class TestValidateSendEmail(unittest.TestCase):
                 f"Test failed with relative template file and list of template paths: {e}"
             )
 
+    def test_found_template_not_checked_again(self):
+        smtpymailer.mailer._FOUND_TEMPLATES.clear()
+        with mock.patch(
+            "smtpymailer.mailer.is_file_with_path",
+            wraps=smtpymailer.mailer.is_file_with_path,
+        ) as mock_is_file:
+            for _ in range(3):
+                validate_send_email(
+                    None,
+                    self.template_file,
+                    ["./missing", self.template_path, "./not_checked"],
+                    "Subject",
+                    ["recipient@mail.com"],
+                )
+
+        # the relative name and "./missing" miss on the first call, then the found path is remembered
+        self.assertEqual(mock_is_file.call_count, 3 + 2 * 2)
+
     def test_template_with_absolute_path(self):
         """Test validate_send_email with absolute template file path."""
         try:
@@ -0,0 +1,175 @@
+import smtplib
+import socket
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from smtpymailer.pool import SmtpConnectionPool
+
+
+class TestSmtpConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.servers = []
+
+        def connect():
+            server = mock.MagicMock()
+            server.sendmail.return_value = {}
+            server.noop.return_value = (250, b"OK")
+            self.servers.append(server)
+            return server
+
+        self.connect = connect
+
+    def test_connection_reused_between_messages(self):
+        with SmtpConnectionPool(self.connect, size=2) as pool:
+            for _ in range(5):
+                pool.send("foo@example.com", ["bar@example.com"], "message")
+
+        self.assertEqual(len(self.servers), 1)
+        self.assertEqual(self.servers[0].sendmail.call_count, 5)
+        self.servers[0].quit.assert_called_once()
+
+    def test_connection_recycled_after_max_messages(self):
+        with SmtpConnectionPool(
+            self.connect, size=1, max_messages_per_connection=2
+        ) as pool:
+            for _ in range(5):
+                pool.send("foo@example.com", ["bar@example.com"], "message")
+
+        self.assertEqual(len(self.servers), 3)
+        self.assertEqual(
+            [server.sendmail.call_count for server in self.servers], [2, 2, 1]
+        )
+
+    def test_reconnects_when_server_disconnected(self):
+        with SmtpConnectionPool(self.connect, size=1) as pool:
+            pool.send("foo@example.com", ["bar@example.com"], "message")
+            self.servers[0].sendmail.side_effect = smtplib.SMTPServerDisconnected()
+            pool.send("foo@example.com", ["bar@example.com"], "message")
+
+        self.assertEqual(len(self.servers), 2)
+        self.assertEqual(self.servers[1].sendmail.call_count, 1)
+
+    def test_idle_connection_checked_with_noop(self):
+        with SmtpConnectionPool(self.connect, size=1, keepalive_interval=0) as pool:
+            pool.send("foo@example.com", ["bar@example.com"], "message")
+            self.servers[0].noop.return_value = (421, b"Timeout")
+            pool.send("foo@example.com", ["bar@example.com"], "message")
+
+        self.assertEqual(len(self.servers), 2)
+
+    def test_send_errors_are_raised(self):
+        with SmtpConnectionPool(self.connect, size=1) as pool:
+            pool.send("foo@example.com", ["bar@example.com"], "message")
+            self.servers[0].sendmail.side_effect = smtplib.SMTPDataError(554, b"No")
+            with self.assertRaises(smtplib.SMTPDataError):
+                pool.send("foo@example.com", ["bar@example.com"], "message")
+
+    @mock.patch("smtpymailer.pool.time.sleep")
+    def test_transient_errors_retried_with_backoff(self, mock_sleep):
+        def connect():
+            server = self.connect()
+            server.sendmail.side_effect = [
+                smtplib.SMTPDataError(451, b"Busy"),
+                smtplib.SMTPSenderRefused(450, b"Try later", "foo@example.com"),
+                {},
+            ]
+            return server
+
+        with SmtpConnectionPool(connect, size=1, retry_backoff=0.5) as pool:
+            self.assertEqual(
+                pool.send("foo@example.com", ["bar@example.com"], "message"), {}
+            )
+
+        # the refused replies leave the connection usable, so every attempt goes over it
+        self.assertEqual(len(self.servers), 1)
+        self.assertEqual(mock_sleep.call_args_list, [mock.call(0.5), mock.call(1.0)])
+
+    @mock.patch("smtpymailer.pool.time.sleep")
+    def test_permanent_errors_not_retried(self, mock_sleep):
+        with SmtpConnectionPool(self.connect, size=1) as pool:
+            pool.send("foo@example.com", ["bar@example.com"], "message")
+            self.servers[0].sendmail.side_effect = smtplib.SMTPDataError(554, b"No")
+            with self.assertRaises(smtplib.SMTPDataError):
+                pool.send("foo@example.com", ["bar@example.com"], "message")
+
+        mock_sleep.assert_not_called()
+
+    def test_connection_kept_after_refusal(self):
+        with SmtpConnectionPool(self.connect, size=1) as pool:
+            pool.send("foo@example.com", ["bar@example.com"], "message")
+            self.servers[0].sendmail.side_effect = [
+                smtplib.SMTPDataError(554, b"No"),
+                smtplib.SMTPRecipientsRefused({"bar@example.com": (550, b"No")}),
+                {},
+            ]
+            with self.assertRaises(smtplib.SMTPDataError):
+                pool.send("foo@example.com", ["bar@example.com"], "message")
+            with self.assertRaises(smtplib.SMTPRecipientsRefused):
+                pool.send("foo@example.com", ["bar@example.com"], "message")
+            pool.send("foo@example.com", ["bar@example.com"], "message")
+
+        self.assertEqual(len(self.servers), 1)
+        self.assertEqual(self.servers[0].sendmail.call_count, 4)
+
+    @mock.patch("smtpymailer.pool.time.sleep")
+    def test_retries_limited(self, mock_sleep):
+        def connect():
+            server = self.connect()
+            server.sendmail.side_effect = smtplib.SMTPDataError(421, b"Closing")
+            return server
+
+        with SmtpConnectionPool(connect, size=1, retries=2) as pool:
+            with self.assertRaises(smtplib.SMTPDataError):
+                pool.send("foo@example.com", ["bar@example.com"], "message")
+
+        self.assertEqual(len(self.servers), 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    def test_pool_size_limits_connections(self):
+        with SmtpConnectionPool(self.connect, size=3) as pool:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                for _ in range(40):
+                    executor.submit(
+                        pool.send, "foo@example.com", ["bar@example.com"], "message"
+                    )
+
+        self.assertLessEqual(len(self.servers), 3)
+        self.assertEqual(
+            sum(server.sendmail.call_count for server in self.servers), 40
+        )
+
+    def test_tcp_keepalive_enabled(self):
+        with SmtpConnectionPool(self.connect, size=1) as pool:
+            pool.send("foo@example.com", ["bar@example.com"], "message")
+            pool.send("foo@example.com", ["bar@example.com"], "message")
+
+        self.servers[0].sock.setsockopt.assert_any_call(
+            socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1
+        )
+        self.assertEqual(
+            self.servers[0].sock.setsockopt.call_count,
+            2 if hasattr(socket, "TCP_KEEPIDLE") else 1,
+        )
+
+    def test_added_connection_used_first(self):
+        with SmtpConnectionPool(self.connect, size=1) as pool:
+            added = self.connect()
+            pool.add(added)
+            pool.add(self.connect())
+            pool.send("foo@example.com", ["bar@example.com"], "message")
+
+        self.assertEqual(len(self.servers), 2)
+        added.sendmail.assert_called_once()
+        self.servers[1].quit.assert_called_once()
+        self.servers[1].sendmail.assert_not_called()
+
+    def test_closed_pool_raises(self):
+        pool = SmtpConnectionPool(self.connect)
+        pool.close_all()
+        with self.assertRaises(ValueError):
+            pool.send("foo@example.com", ["bar@example.com"], "message")
+
+
+if __name__ == "__main__":
+    unittest.main()
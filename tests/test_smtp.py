@@ -0,0 +1,121 @@
+import smtplib
+import unittest
+from unittest import mock
+
+from smtpymailer.smtp import PipeliningSMTP
+
+
+class TestPipeliningSMTP(unittest.TestCase):
+    def make_server(self, replies, features=None):
+        server = PipeliningSMTP()
+        server.ehlo_resp = b"mail.example.com"
+        server.does_esmtp = True
+        server.esmtp_features = (
+            {"pipelining": "", "size": "10240000"} if features is None else features
+        )
+        server.send = mock.Mock()
+        server.getreply = mock.Mock(side_effect=replies)
+        server.close = mock.Mock()
+        server._rset = mock.Mock()
+        return server
+
+    def test_envelope_sent_in_one_batch(self):
+        server = self.make_server(
+            [(250, b"OK"), (250, b"OK"), (250, b"OK"), (354, b"Go"), (250, b"Queued")]
+        )
+
+        refused = server.sendmail(
+            "foo@example.com",
+            ["bar@example.com", "baz@example.com"],
+            b"Subject: Hi\r\n\r\n.Body",
+        )
+
+        self.assertEqual(refused, {})
+        self.assertEqual(server.send.call_count, 2)
+        self.assertEqual(
+            server.send.call_args_list[0].args[0],
+            "mail FROM:<foo@example.com> size=20\r\n"
+            "rcpt TO:<bar@example.com>\r\n"
+            "rcpt TO:<baz@example.com>\r\n"
+            "data\r\n",
+        )
+        self.assertEqual(
+            server.send.call_args_list[1].args[0], b"Subject: Hi\r\n\r\n..Body\r\n.\r\n"
+        )
+
+    def test_refused_recipient_returned(self):
+        server = self.make_server(
+            [
+                (250, b"OK"),
+                (550, b"Unknown"),
+                (250, b"OK"),
+                (354, b"Go"),
+                (250, b"Queued"),
+            ]
+        )
+
+        refused = server.sendmail(
+            "foo@example.com", ["bar@example.com", "baz@example.com"], b"message"
+        )
+
+        self.assertEqual(refused, {"bar@example.com": (550, b"Unknown")})
+
+    def test_all_recipients_refused(self):
+        server = self.make_server(
+            [(250, b"OK"), (550, b"Unknown"), (554, b"No recipients")]
+        )
+
+        with self.assertRaises(smtplib.SMTPRecipientsRefused):
+            server.sendmail("foo@example.com", ["bar@example.com"], b"message")
+
+        server._rset.assert_called_once()
+        self.assertEqual(server.send.call_count, 1)
+
+    def test_all_recipients_refused_after_data_accepted(self):
+        server = self.make_server(
+            [(250, b"OK"), (550, b"Unknown"), (354, b"Go"), (554, b"Empty")]
+        )
+
+        with self.assertRaises(smtplib.SMTPRecipientsRefused):
+            server.sendmail("foo@example.com", ["bar@example.com"], b"message")
+
+        server.send.assert_called_with(b".\r\n")
+        self.assertEqual(server.getreply.call_count, 4)
+
+    def test_sender_refused(self):
+        server = self.make_server(
+            [(421, b"Closing"), (503, b"No MAIL"), (503, b"No MAIL")]
+        )
+
+        with self.assertRaises(smtplib.SMTPSenderRefused):
+            server.sendmail("foo@example.com", ["bar@example.com"], b"message")
+
+        server.close.assert_called_once()
+
+    def test_message_refused(self):
+        server = self.make_server(
+            [(250, b"OK"), (250, b"OK"), (354, b"Go"), (552, b"Too big")]
+        )
+
+        with self.assertRaises(smtplib.SMTPDataError):
+            server.sendmail("foo@example.com", ["bar@example.com"], b"message")
+
+        server._rset.assert_called_once()
+
+    def test_without_pipelining_commands_sent_one_by_one(self):
+        server = self.make_server([], features={})
+        server.mail = mock.Mock(return_value=(250, b"OK"))
+        server.rcpt = mock.Mock(return_value=(250, b"OK"))
+        server.data = mock.Mock(return_value=(250, b"Queued"))
+
+        refused = server.sendmail("foo@example.com", ["bar@example.com"], b"message")
+
+        self.assertEqual(refused, {})
+        server.mail.assert_called_once()
+        server.rcpt.assert_called_once()
+        server.data.assert_called_once_with(b"message")
+        server.send.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,16 @@
+import base64
 import os
+import re
 import tempfile
 import unittest
+from unittest import mock
 from pathlib import Path
 
-from smtpymailer.html_parse import convert_html_to_plain_text
+from smtpymailer.html_parse import (
+    convert_html_to_plain_text,
+    _PLAIN_TEXT_CLEANUP_RE,
+    _clean_plain_text_match,
+)
 from smtpymailer.utils import (
     is_file_with_path,
     ensure_list,
@@ -12,6 +19,8 @@ from smtpymailer.utils import (
     find_project_root,
     build_all_recipients_and_validate,
     construct_mime_object,
+    b64encode_to_str,
+    encode_base64,
 )
 
 from email_validator import EmailNotValidError
@@ -103,6 +112,49 @@ class TestCreateMime(unittest.TestCase):
 
         self.assertTrue(isinstance(part, MIMEBase))
 
+    # Should encode the attachment in chunks to the same payload as a single encode
+    def test_chunked_payload(self):
+        path = os.path.abspath("./tests/assets/dog.mp4")
+        with open(path, "rb") as attachment:
+            part = construct_mime_object(path, attachment)
+        with open(path, "rb") as attachment:
+            data = attachment.read()
+
+        self.assertEqual(part.get_payload(), base64.encodebytes(data).decode("ascii"))
+        self.assertEqual(part.get_payload(decode=True), data)
+        self.assertEqual(part["Content-Transfer-Encoding"], "base64")
+
+    # Should fall back to the system mimetypes, then application/octet-stream, for extensions not in the mapping
+    def test_unknown_extensions(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for filename, content_type in [
+                ("data.ps", "application/postscript"),
+                ("data.midi", "audio/midi"),
+                ("data.smtpymailer", "application/octet-stream"),
+            ]:
+                path = os.path.join(tmp_dir, filename)
+                with open(path, "wb") as f:
+                    f.write(b"data")
+                with open(path, "rb") as attachment:
+                    part = construct_mime_object(path, attachment)
+
+                self.assertEqual(part.get_content_type(), content_type)
+                self.assertEqual(part.get_payload(decode=True), b"data")
+
+
+
+class TestB64EncodeToStr(unittest.TestCase):
+    def test_matches_stdlib(self):
+        data = bytes(range(256)) * 3
+        self.assertEqual(b64encode_to_str(data), base64.b64encode(data).decode("ascii"))
+
+
+class TestEncodeBase64(unittest.TestCase):
+    def test_matches_stdlib_encoder(self):
+        data = os.urandom(10000)
+        expected = MIMEImage(data, _subtype="png")
+        result = MIMEImage(data, _subtype="png", _encoder=encode_base64)
+        self.assertEqual(result.as_string(), expected.as_string())
 
 
 class TestHtmlConversion(unittest.TestCase):
@@ -121,6 +173,31 @@ class TestHtmlConversion(unittest.TestCase):
         expected_output = "Hello, Welcome to Python."
         self.assertEqual(convert_html_to_plain_text(html_input), expected_output)
 
+    def test_plain_text_cleanup_matches_separate_passes(self):
+        samples = [
+            "# Title\n\n\nBody",
+            "a\n  # \n b",
+            "a\n \n## b\n\t\n\nc",
+            "no # header#\n#\nhere",
+        ]
+        for sample in samples:
+            expected = re.sub(r"\n\s*\n", "\n\n", re.sub(r"#+ ", "", sample))
+            self.assertEqual(
+                _PLAIN_TEXT_CLEANUP_RE.sub(_clean_plain_text_match, sample), expected
+            )
+
+    def test_convert_html_entities_without_tags_to_plain_text(self):
+        html_input = "Fish &amp; Chips"
+        expected_output = "Fish & Chips"
+        self.assertEqual(convert_html_to_plain_text(html_input), expected_output)
+
+    def test_convert_same_html_is_cached(self):
+        html_input = "<p>Cached</p><p>conversion</p>"
+        first = convert_html_to_plain_text(html_input)
+        hits = convert_html_to_plain_text.cache_info().hits
+        self.assertEqual(convert_html_to_plain_text(html_input), first)
+        self.assertEqual(convert_html_to_plain_text.cache_info().hits, hits + 1)
+
 
 class TestIsFileWithPath(unittest.TestCase):
     def setUp(self):
@@ -174,6 +251,15 @@ class TestEnsureList(unittest.TestCase):
 
 
 class TestRecipientsToStr(unittest.TestCase):
+    def test_str_recipient(self):
+        recipients = "test1@example.com, test2@example.com"
+        self.assertIs(recipients_to_str(recipients), recipients)
+
+    def test_non_str_recipients(self):
+        recipients = ["test1@example.com", Path("test2@example.com")]
+        expected_output = "test1@example.com, test2@example.com"
+        self.assertEqual(recipients_to_str(recipients), expected_output)
+
     def test_empty_recipients(self):
         recipients = []
         expected_output = ""
@@ -305,6 +391,27 @@ class TestBuildAllRecipientsAndValidate(unittest.TestCase):
         with self.assertRaises(EmailNotValidError):
             build_all_recipients_and_validate(recipients, None, bcc_recipients)
 
+    #  Should only return each recipient once, keeping the order they were first listed in
+    def test_duplicate_recipients(self):
+        result = build_all_recipients_and_validate(
+            ["test1@example.com", "test2@example.com", "test1@example.com"],
+            "test2@example.com",
+            ["test3@example.com", "test1@example.com"],
+        )
+        self.assertEqual(
+            result, ["test1@example.com", "test2@example.com", "test3@example.com"]
+        )
+
+    #  Should only check the basic format, without normalizing, when validation is turned off
+    def test_without_validation(self):
+        recipients = ["Test1@Example.com", "test2@example.com"]
+        with mock.patch("smtpymailer.utils.validate_user_email") as mock_validate:
+            result = build_all_recipients_and_validate(recipients, validate=False)
+
+        self.assertEqual(result, recipients)
+        mock_validate.assert_not_called()
+        with self.assertRaises(EmailNotValidError):
+            build_all_recipients_and_validate(["invalid email@example"], validate=False)
 
 
 
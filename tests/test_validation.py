@@ -1,5 +1,11 @@
 import socket
+import threading
+import time
+import traceback
 import unittest
+from unittest import mock
+
+import smtpymailer.validation
 from smtpymailer.validation import (
     validate_user_email,
     validate_dmarc_record,
@@ -8,7 +14,21 @@ from smtpymailer.validation import (
     get_address_type,
     validate_dkim_record,
     spf_check,
+    resolve_txt_records,
+    validate_email_format,
+    clear_dns_cache,
 )
+from email_validator import EmailNotValidError
+
+
+def make_txt_answer(records, ttl=300):
+    """Builds a fake dnspython TXT answer from a list of record strings."""
+    answer = mock.MagicMock()
+    answer.__iter__.return_value = [
+        mock.Mock(strings=[record.encode()]) for record in records
+    ]
+    answer.rrset.ttl = ttl
+    return answer
 
 
 class TestValidation(unittest.TestCase):
@@ -30,6 +50,25 @@ class TestValidation(unittest.TestCase):
                 "invalid_email", return_normalized=False, check_deliverability=False
             )
 
+    @mock.patch(
+        "smtpymailer.validation.validate_email",
+        wraps=smtpymailer.validation.validate_email,
+    )
+    def test_validate_user_email_cached(self, mock_validate_email):
+        smtpymailer.validation._validate_email_syntax.cache_clear()
+
+        for _ in range(3):
+            result = validate_user_email("cached@EXAMPLE.com")
+
+        self.assertEqual(result, "cached@example.com")
+        self.assertEqual(mock_validate_email.call_count, 1)
+
+    def test_validate_email_format(self):
+        self.assertEqual(validate_email_format("test@EXAMPLE.com"), "test@EXAMPLE.com")
+        for email in ["invalid_email", "test@example", "te st@example.com", "a@b@c.com"]:
+            with self.assertRaises(EmailNotValidError):
+                validate_email_format(email)
+
     def test_validate_dmarc_record_valid(self):
         valid_dmarc_record = (
             "v=DMARC1; p=none; rua=mailto:abc@example.com; pct=100; fo=1;"
@@ -132,6 +171,20 @@ class TestValidation(unittest.TestCase):
         expected_result = {"invalid": address}
         self.assertEqual(get_address_type(address), expected_result)
 
+    @mock.patch(
+        "smtpymailer.validation.validators.domain",
+        wraps=smtpymailer.validation.validators.domain,
+    )
+    def test_address_type_cached(self, mock_domain):
+        smtpymailer.validation._get_address_type.cache_clear()
+
+        first = get_address_type("mail.example.com")
+        first["domain"] = "changed"
+        second = get_address_type("mail.example.com")
+
+        self.assertEqual(second, {"domain": "mail.example.com"})
+        mock_domain.assert_called_once()
+
     def test_validate_dkim_record_valid(self):
         valid_dkim_record = "v=DKIM1; h=sha256; k=rsa; p=MIIBIjANBgkqhkiG9w0BAQEFAAOCAQ8AMIIBCgKCAQEAzgLBsMFlJoX5XRcgT7T/"
         self.assertEqual(
@@ -142,6 +195,10 @@ class TestValidation(unittest.TestCase):
         invalid_dkim_record = "invalid_dkim_record"
         self.assertEqual(validate_dkim_record(invalid_dkim_record), False)
 
+    def test_validate_dkim_record_invalid_public_key(self):
+        invalid_dkim_record = "v=DKIM1; k=rsa; p=MIIBIjANBgkqhkiG9w0B!AQEFAAOCAQ8A"
+        self.assertEqual(validate_dkim_record(invalid_dkim_record), False)
+
     def test_validate_dkim_record_empty(self):
         empty_dkim_record = ""
         self.assertEqual(validate_dkim_record(empty_dkim_record), False)
@@ -222,6 +279,12 @@ class TestSpfCheck(unittest.TestCase):
         result = spf_check(spf_record, ipv4=ipv4_address)
         self.assertFalse(result)
 
+    #  Check an ip6 mechanism with only an IPv4 address to check.
+    def test_ipv6_mechanism_without_ipv6_address(self):
+        spf_record = "v=spf1 ip6:2001:0db8::/32 ip4:192.0.2.0/24 -all"
+        self.assertTrue(spf_check(spf_record, ipv4="192.0.2.1"))
+        self.assertFalse(spf_check(spf_record, ipv4="198.51.100.1"))
+
     def test_spf_check_with_ipv6(self):
         spf_record = "v=spf1 ip6:2001:0db8::/32 -all"
         ipv6_address = "2001:0db8::1234"
@@ -233,5 +296,139 @@ class TestSpfCheck(unittest.TestCase):
         self.assertFalse(spf_check(spf_record, ipv6=ipv6_address_outside))
 
 
+class TestResolveTxtRecords(unittest.TestCase):
+    def setUp(self):
+        smtpymailer.validation._TXT_CACHE.clear()
+
+    @mock.patch("dns.resolver.Resolver.resolve")
+    def test_records_are_cached(self, mock_resolve):
+        mock_resolve.return_value = make_txt_answer(["v=spf1 ip4:192.0.2.0/24 -all"])
+
+        first = resolve_txt_records("example.com")
+        second = resolve_txt_records("example.com")
+
+        self.assertEqual(first, ("v=spf1 ip4:192.0.2.0/24 -all",))
+        self.assertEqual(first, second)
+        self.assertEqual(mock_resolve.call_count, 1)
+
+    def test_shared_resolver(self):
+        resolver = smtpymailer.validation._get_resolver()
+
+        self.assertIs(resolver, smtpymailer.validation._get_resolver())
+        self.assertEqual(resolver.lifetime, smtpymailer.validation._DNS_LIFETIME)
+        self.assertEqual(resolver.timeout, smtpymailer.validation._DNS_TIMEOUT)
+        self.assertIsNotNone(resolver.cache)
+
+    @mock.patch("dns.resolver.Resolver.resolve")
+    def test_expired_records_are_resolved_again(self, mock_resolve):
+        mock_resolve.return_value = make_txt_answer(["v=spf1 -all"], ttl=0)
+
+        resolve_txt_records("example.com")
+        resolve_txt_records("example.com")
+
+        self.assertEqual(mock_resolve.call_count, 2)
+
+    @mock.patch("dns.resolver.Resolver.resolve")
+    def test_failed_lookups_are_cached(self, mock_resolve):
+        import dns.resolver
+
+        mock_resolve.side_effect = dns.resolver.NXDOMAIN()
+
+        for _ in range(2):
+            with self.assertRaises(dns.resolver.NXDOMAIN):
+                resolve_txt_records("missing.example.com")
+        self.assertEqual(mock_resolve.call_count, 1)
+
+        cached = smtpymailer.validation._TXT_CACHE["missing.example.com"]
+        self.assertLessEqual(
+            cached[0] - time.monotonic(), smtpymailer.validation._TXT_CACHE_NEGATIVE_TTL
+        )
+
+    @mock.patch("dns.resolver.Resolver.resolve")
+    def test_cached_failure_traceback_not_grown(self, mock_resolve):
+        import dns.resolver
+
+        mock_resolve.side_effect = dns.resolver.NXDOMAIN()
+
+        with self.assertRaises(dns.resolver.NXDOMAIN):
+            resolve_txt_records("missing.example.com")
+        depths = []
+        for _ in range(3):
+            try:
+                resolve_txt_records("missing.example.com")
+            except dns.resolver.NXDOMAIN as e:
+                depths.append(len(traceback.extract_tb(e.__traceback__)))
+        self.assertEqual(depths, [depths[0]] * 3)
+
+    @mock.patch("dns.resolver.Resolver.resolve")
+    def test_clear_dns_cache(self, mock_resolve):
+        mock_resolve.return_value = make_txt_answer(["v=spf1 -all"])
+
+        resolve_txt_records("example.com")
+        clear_dns_cache()
+        resolve_txt_records("example.com")
+
+        self.assertEqual(mock_resolve.call_count, 2)
+
+    @mock.patch("dns.resolver.Resolver.resolve")
+    def test_spf_include_uses_cache(self, mock_resolve):
+        mock_resolve.return_value = make_txt_answer(["v=spf1 ip4:192.0.2.0/24 -all"])
+        spf_record = "v=spf1 include:_spf.example.com -all"
+
+        self.assertTrue(spf_check(spf_record, ipv4="192.0.2.1"))
+        self.assertTrue(spf_check(spf_record, ipv4="192.0.2.1"))
+        self.assertEqual(mock_resolve.call_count, 1)
+
+    @mock.patch("dns.resolver.Resolver.resolve")
+    def test_spf_includes_checked_concurrently(self, mock_resolve):
+        answers = {
+            "_spf.one.com": make_txt_answer(["v=spf1 ip4:198.51.100.0/24 -all"]),
+            "_spf.two.com": make_txt_answer(["v=spf1 ip4:192.0.2.0/24 -all"]),
+        }
+
+        def resolve(name, rtype, **kwargs):
+            if name not in answers:
+                raise Exception("NXDOMAIN")
+            return answers[name]
+
+        mock_resolve.side_effect = resolve
+        spf_record = "v=spf1 include:_spf.missing.com include:_spf.one.com include:_spf.two.com -all"
+
+        self.assertTrue(spf_check(spf_record, ipv4="192.0.2.1"))
+        self.assertFalse(spf_check(spf_record, ipv4="203.0.113.1"))
+
+    @mock.patch("smtpymailer.validation.resolve_txt_records")
+    def test_spf_include_cycle(self, mock_resolve):
+        records = {
+            "a.com": ("v=spf1 include:b.com include:c.com -all",),
+            "b.com": ("v=spf1 include:a.com include:c.com -all",),
+            "c.com": ("v=spf1 include:a.com include:b.com -all",),
+        }
+        threads = []
+
+        def resolve(domain):
+            threads.append(threading.active_count())
+            return records[domain]
+
+        mock_resolve.side_effect = resolve
+        baseline = threading.active_count()
+
+        self.assertFalse(spf_check(records["a.com"][0], ipv4="192.0.2.1"))
+        self.assertEqual(mock_resolve.call_count, 3)
+        self.assertLessEqual(max(threads), baseline + 2)
+
+    @mock.patch("smtpymailer.validation.resolve_txt_records")
+    def test_spf_include_lookup_limit(self, mock_resolve):
+        # every domain includes the next one, so the chain never ends
+        mock_resolve.side_effect = lambda domain: (
+            f"v=spf1 include:{int(domain.split('.')[0]) + 1}.com -all",
+        )
+
+        self.assertFalse(spf_check("v=spf1 include:0.com -all", ipv4="192.0.2.1"))
+        self.assertEqual(
+            mock_resolve.call_count, smtpymailer.validation._SPF_LOOKUP_LIMIT
+        )
+
+
 if __name__ == "__main__":
     unittest.main()